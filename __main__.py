@@ -4,18 +4,19 @@ CLI entry point for mentat-gui package.
 
 import asyncio
 import argparse
+import functools
 from datetime import datetime, timedelta
 from pathlib import Path
 
 from config import get_settings, setup_centralized_logging, get_logger
-from signal_scanner import SignalScanner
 
 # Setup centralized logging immediately
 setup_centralized_logging('cli.log')
 logger = get_logger(__name__)
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
+@functools.cache
+def _parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (once per process)."""
     parser = argparse.ArgumentParser(
         description="Crypto Signal Scanner CLI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -73,6 +74,12 @@ Examples:
         action='store_true',
         help='Skip generating plots'
     )
+    parser.add_argument(
+        '--format',
+        choices=('csv', 'parquet'),
+        default='csv',
+        help='File format for saved results (default: csv)'
+    )
     parser.add_argument(
         '--output-dir', 
         type=str, 
@@ -92,11 +99,19 @@ Examples:
         help='Disable Numba acceleration'
     )
     
-    return parser.parse_args()
+    return parser
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    return _parser().parse_args()
 
 def parse_date(date_str: str) -> datetime:
     """Parse date string in YYYY-MM-DD format."""
     try:
+        # fromisoformat would also take times, offsets and compact forms
+        # like 20240101; strptime alone would take unpadded 2024-1-1
+        if len(date_str) != 10:
+            raise ValueError(date_str)
         return datetime.strptime(date_str, '%Y-%m-%d')
     except ValueError:
         raise argparse.ArgumentTypeError(f"Invalid date format: {date_str}. Use YYYY-MM-DD")
@@ -128,11 +143,15 @@ async def main() -> None:
     output_dir = args.output_dir or Path.cwd()
     if isinstance(output_dir, str):
         output_dir = Path(output_dir)
-    output_dir.mkdir(exist_ok=True)
+    if not output_dir.is_dir():
+        output_dir.mkdir(parents=True, exist_ok=True)
     
     logger.info(f"Starting signal scan from {start.date()} to {end.date()}")
     
     try:
+        # Imported here so --help and argument errors skip pandas/numpy
+        from signal_scanner import SignalScanner
+        
         # Create scanner
         scanner = SignalScanner(use_numba=not args.no_numba)
         
@@ -149,25 +168,36 @@ async def main() -> None:
             logger.error(f"Scan failed: {results['error']}")
             return
         
-        # Save results
-        scanner.save_results(results, output_dir)
-        
-        # Log summary
-        logger.info("Scan Results:")
-        logger.info(f"  Period: {start.date()} to {end.date()}")
-        logger.info(f"  Series analyzed: {results['series_count']}")
-        logger.info(f"  Data points: {results['data_points']}")
-        logger.info(f"  Max lag tested: {results['max_lag']}")
-        
-        if not results['top_correlations'].empty:
-            logger.info("Top correlations:")
-            for _, row in results['top_correlations'].iterrows():
-                logger.info(f"  {row['lead_series']} → {row['lag_series']} "
-                           f"(lag: {row['lag']:2d}, corr: {row['correlation']:.3f})")
+        # Save results in a worker thread; plots (below) render meanwhile
+        save_task = asyncio.create_task(
+            asyncio.to_thread(scanner.save_results, results, output_dir, fmt=args.format)
+        )
         
-        # Generate plots if requested
-        if not args.no_plots:
-            await generate_plots(results, output_dir)
+        try:
+            # Log summary
+            logger.info("Scan Results:")
+            logger.info(f"  Period: {start.date()} to {end.date()}")
+            logger.info(f"  Series analyzed: {results['series_count']}")
+            logger.info(f"  Data points: {results['data_points']}")
+            logger.info(f"  Max lag tested: {results['max_lag']}")
+            
+            if not results['top_correlations'].empty:
+                # Format all rows column-wise and emit them as one record
+                top = results['top_correlations']
+                lines = (
+                    "  " + top['lead_series'].astype(str)
+                    + " → " + top['lag_series'].astype(str)
+                    + " (lag: " + top['lag'].map('{:2d}'.format)
+                    + ", corr: " + top['correlation'].map('{:.3f}'.format) + ")"
+                )
+                logger.info("Top correlations:\n%s", "\n".join(lines))
+            
+            # Generate plots if requested
+            if not args.no_plots:
+                await generate_plots(results, output_dir)
+        finally:
+            # Never leave the write unawaited, even if plotting fails
+            await save_task
         
         logger.info(f"Results saved to: {output_dir}")
         
@@ -177,45 +207,68 @@ async def main() -> None:
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
 
+def _render_heatmap(pivot_data, path: Path) -> None:
+    """Render the correlation heatmap to ``path``."""
+    from matplotlib.figure import Figure
+    
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
+    image = ax.imshow(pivot_data, cmap='RdBu_r', aspect='auto')
+    fig.colorbar(image, ax=ax, label='Correlation')
+    ax.set_xticks(range(len(pivot_data.columns)))
+    ax.set_xticklabels(pivot_data.columns, rotation=45)
+    ax.set_yticks(range(len(pivot_data.index)))
+    ax.set_yticklabels(pivot_data.index)
+    ax.set_title('Lead-Lag Correlation Matrix')
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+
+def _render_composite(signal, path: Path) -> None:
+    """Render the composite signal line plot to ``path``."""
+    from matplotlib.figure import Figure
+    
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    # Plain Axes.plot: pandas plotting goes through pyplot, which is not
+    # safe from this worker thread
+    ax.plot(signal.index, signal.to_numpy())
+    ax.set_title('Composite Signal')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Signal Strength')
+    ax.grid(True)
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+
 async def generate_plots(results: dict, output_dir: Path) -> None:
-    """Generate plots from scan results."""
+    """Generate plots from scan results.
+    
+    Figures are built on bare ``Figure`` objects (Agg, no pyplot state) and
+    rendered in a worker thread so the event loop is not blocked.
+    """
     try:
-        import matplotlib.pyplot as plt
+        import matplotlib  # noqa: F401  (fail fast if unavailable)
         
         # Correlation heatmap
         if not results['all_correlations'].empty:
-            plt.figure(figsize=(12, 8))
-            
-            # Create pivot table for heatmap
-            pivot_data = results['all_correlations'].pivot_table(
-                index='lead_series', 
-                columns='lag_series', 
-                values='correlation',
-                aggfunc='mean'
+            # Average over lags (one row per lag for each pair), then pivot
+            pair_means = results['all_correlations'].groupby(
+                ['lead_series', 'lag_series'], sort=False, as_index=False
+            )['correlation'].mean()
+            pivot_data = pair_means.pivot(
+                index='lead_series',
+                columns='lag_series',
+                values='correlation'
             )
             
-            plt.imshow(pivot_data, cmap='RdBu_r', aspect='auto')
-            plt.colorbar(label='Correlation')
-            plt.xticks(range(len(pivot_data.columns)), pivot_data.columns, rotation=45)
-            plt.yticks(range(len(pivot_data.index)), pivot_data.index)
-            plt.title('Lead-Lag Correlation Matrix')
-            plt.tight_layout()
-            plt.savefig(output_dir / 'correlations.png', dpi=300, bbox_inches='tight')
-            plt.close()
+            await asyncio.to_thread(_render_heatmap, pivot_data, output_dir / 'correlations.png')
             
             logger.info("Generated correlation heatmap")
         
         # Composite signal plot
         if 'composite_signal' in results and results['composite_signal'] is not None:
-            plt.figure(figsize=(12, 6))
-            results['composite_signal'].plot()
-            plt.title('Composite Signal')
-            plt.xlabel('Date')
-            plt.ylabel('Signal Strength')
-            plt.grid(True)
-            plt.tight_layout()
-            plt.savefig(output_dir / 'composite_signal.png', dpi=300, bbox_inches='tight')
-            plt.close()
+            await asyncio.to_thread(
+                _render_composite, results['composite_signal'], output_dir / 'composite_signal.png'
+            )
             
             logger.info("Generated composite signal plot")
             
@@ -1,12 +1,15 @@
 """
 Global configuration for Crypto Signal Scanner
 """
+import io
 import os
+from functools import lru_cache, wraps
 from pathlib import Path
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 import logging
+import logging.handlers
 import sys
 import warnings
 import atexit
@@ -39,6 +42,11 @@ class Settings(BaseSettings):
     binance_api_key: Optional[str] = Field(default=None, alias="BINANCE_API_KEY")
     max_klines: int = Field(default=1000, alias="MAX_KLINES")
     rate_limit_delay: float = Field(default=0.15, alias="RATE_LIMIT_DELAY")
+    max_concurrent_requests: int = Field(default=8, alias="MAX_CONCURRENT_REQUESTS")
+    use_parquet_cache: bool = Field(default=False, alias="USE_PARQUET_CACHE")
+    # Seconds a Yahoo/FRED/FnG/Trends series cache is served without
+    # checking the API for newer observations; 0 always checks
+    series_cache_ttl: int = Field(default=0, alias="SERIES_CACHE_TTL")
     
     # Default trading settings
     symbol: str = Field(default="BTCUSDT", alias="SYMBOL")
@@ -55,6 +63,12 @@ class Settings(BaseSettings):
     corr_plot: str = Field(default="correlations.png", alias="CORR_PLOT")
     signal_plot: str = Field(default="composite_signal.png", alias="SIGNAL_PLOT")
     
+    # Also log print() calls as PRINT: records when stdout is not a terminal
+    capture_print: bool = Field(default=False, alias="CAPTURE_PRINT")
+    
+    # Abort the process on any logged warning/error or Python warning
+    strict_log_abort: bool = Field(default=False, alias="STRICT_LOG_ABORT")
+    
     # External API keys
     fred_api_key: Optional[str] = Field(default=None, alias="FRED_API_KEY")
     
@@ -78,21 +92,41 @@ class Settings(BaseSettings):
         """Get data sources configuration file path"""
         return PROJECT_ROOT / self.data_sources_file
 
-# Global settings instance
-_settings: Optional[Settings] = None
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings singleton"""
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-        # Ensure directories exist
-        _settings.db_path.mkdir(exist_ok=True)
-        _settings.log_path.mkdir(exist_ok=True)
-    return _settings
+    """Get application settings singleton.
+
+    Call ``get_settings.cache_clear()`` to re-read the environment.
+    """
+    settings = Settings()
+    # Ensure directories exist (a stat is cheaper than a failing mkdir)
+    for directory in (settings.db_path, settings.log_path):
+        if not directory.is_dir():
+            directory.mkdir(parents=True, exist_ok=True)
+    return settings
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the timestamp at most once per wall-clock second."""
+    
+    default_msec_format = None
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (second, rendered timestamp) swapped as one tuple so threads never
+        # observe a half-updated cache
+        self._time_cache = (None, '')
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, cached_time = self._time_cache
+        if second != cached_second:
+            cached_time = super().formatTime(record, datefmt)
+            self._time_cache = (second, cached_time)
+        return cached_time
+
 
 class CentralizedLogger:
-    """Centralized logging system that captures ALL output and aborts on errors/warnings."""
+    """Centralized logging system that captures ALL output and aborts on fatal errors (and on warnings/errors in strict mode)."""
     
     def __init__(self, log_file: str = "app.log"):
         self.settings = get_settings()
@@ -104,86 +138,118 @@ class CentralizedLogger:
         self.logger = None
         self.stdout_capture = None
         self.stderr_capture = None
+        self.file_handler = None
+        self.buffer_handler = None
+        self.console_handler = None
+        self._aborting = False
         self._setup_logging()
         self._capture_all_output()
         self._setup_abort_handlers()
     
     def _setup_logging(self):
         """Setup comprehensive logging configuration."""
-        # Create formatter
-        formatter = logging.Formatter(
+        # Create formatter (shared, so each second's timestamp is rendered once)
+        formatter = CachedTimeFormatter(
             '%(asctime)s [%(levelname)s] %(name)s: %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         
         # Create file handler
-        file_handler = logging.FileHandler(self.log_path, mode='a', encoding='utf-8')
+        file_handler = logging.FileHandler(self.log_path, mode='a', encoding='utf-8', delay=True)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
         
-        # Create console handler (only for non-error messages)
+        # Buffer file output; warnings and above flush immediately
+        buffer_handler = logging.handlers.MemoryHandler(
+            capacity=1024, flushLevel=logging.WARNING, target=file_handler
+        )
+        buffer_handler.setLevel(logging.DEBUG)
+        
+        # Create console handler
         console_handler = logging.StreamHandler(sys.__stdout__)
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
         
-        # Create console error handler (for errors/warnings)
-        error_handler = logging.StreamHandler(sys.__stderr__)
-        error_handler.setLevel(logging.WARNING)
-        error_handler.setFormatter(formatter)
-        
         # Setup root logger
         self.logger = logging.getLogger()
         self.logger.setLevel(logging.DEBUG)
         self.logger.handlers.clear()  # Remove any existing handlers
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(buffer_handler)
         self.logger.addHandler(console_handler)
-        self.logger.addHandler(error_handler)
+        self.file_handler = file_handler
+        self.buffer_handler = buffer_handler
+        self.console_handler = console_handler
         
         # Prevent propagation to avoid duplicate logs
         self.logger.propagate = False
     
     def _capture_all_output(self):
         """Capture all stdout, stderr, and print statements."""
-        # Capture stdout
-        class StdoutCapture:
-            def __init__(self, logger):
-                self.logger = logger
-                self.original_stdout = sys.__stdout__
-            
-            def write(self, text):
-                if text.strip():  # Only log non-empty text
-                    self.logger.info(f"STDOUT: {text.rstrip()}")
-                self.original_stdout.write(text)
-            
-            def flush(self):
-                self.original_stdout.flush()
-        
-        # Capture stderr
-        class StderrCapture:
-            def __init__(self, logger):
+        # Set while a captured line is being logged so that handler writes
+        # cannot re-enter the capture on the same thread
+        reentry = threading.local()
+
+        class StreamCapture:
+            """Line-buffered stream shim that mirrors complete lines into the log."""
+
+            def __init__(self, logger, stream, level, prefix):
                 self.logger = logger
-                self.original_stderr = sys.__stderr__
-            
+                self.stream = stream
+                self.level = level
+                self.prefix = prefix
+                self._buffer = io.StringIO()
+                self._lock = threading.Lock()
+
             def write(self, text):
-                if text.strip():  # Only log non-empty text
-                    self.logger.error(f"STDERR: {text.rstrip()}")
-                self.original_stderr.write(text)
-            
+                if getattr(reentry, 'active', False) or not self.logger.isEnabledFor(self.level):
+                    self.stream.write(text)
+                    return
+                with self._lock:
+                    self._buffer.write(text)
+                    if '\n' not in text:
+                        self.stream.write(text)
+                        return
+                    complete, _, tail = self._buffer.getvalue().rpartition('\n')
+                    self._buffer = io.StringIO()
+                    self._buffer.write(tail)
+                # Echo up to the last newline, log, then echo the unterminated
+                # tail, so a record never lands in the middle of an output line
+                head, _, rest = text.rpartition('\n')
+                self.stream.write(head + '\n')
+                if complete.strip():  # Only log non-empty text
+                    reentry.active = True
+                    try:
+                        self.logger.log(self.level, "%s: %s", self.prefix, complete.rstrip())
+                    finally:
+                        reentry.active = False
+                if rest:
+                    self.stream.write(rest)
+
             def flush(self):
-                self.original_stderr.flush()
-        
-        self.stdout_capture = StdoutCapture(self.logger)
-        self.stderr_capture = StderrCapture(self.logger)
+                self.stream.flush()
+
+        # Capture stdout and stderr
+        self.stdout_capture = StreamCapture(self.logger, sys.__stdout__, logging.INFO, "STDOUT")
+        self.stderr_capture = StreamCapture(self.logger, sys.__stderr__, logging.ERROR, "STDERR")
         
         # Replace stdout and stderr
         sys.stdout = self.stdout_capture
         sys.stderr = self.stderr_capture
         
-        # Override print function
+        # print() output already reaches the log through the stdout capture;
+        # the extra PRINT: record is only kept for interactive consoles or
+        # when explicitly requested
+        if not (self.settings.capture_print or sys.__stdout__.isatty()):
+            return
+        
+        # Override print function. wraps() keeps print's identity
+        # (builtins.print) for libraries that resolve it by name, e.g. numba
+        @wraps(self.original_print)
         def logged_print(*args, **kwargs):
-            message = ' '.join(str(arg) for arg in args)
-            if message.strip():
-                self.logger.info(f"PRINT: {message}")
+            if args and self.logger.isEnabledFor(logging.INFO):
+                message = ' '.join(map(str, args))
+                if message and not message.isspace():
+                    self.logger.info("PRINT: %s", message)
             self.original_print(*args, **kwargs)
         
         # Replace built-in print
@@ -191,10 +257,21 @@ class CentralizedLogger:
         builtins.print = logged_print
     
     def _setup_abort_handlers(self):
-        """Setup handlers to abort immediately on any error or warning."""
+        """
+        Setup handlers to abort immediately on uncaught exceptions and signals.
+        
+        With ``STRICT_LOG_ABORT`` set, any logged warning or error and any
+        Python warning aborts as well.
+        """
+        strict = self.settings.strict_log_abort
         
         def INSTANT_ABORT(message="INSTANT ABORT DUE TO ERROR OR WARNING"):
             """INSTANTLY abort to command line - no continuation"""
+            # Logging the abort below passes through the abort filter again
+            if self._aborting:
+                return
+            self._aborting = True
+            
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             abort_message = f"\n[{timestamp}] INSTANT ABORT: {message}\n"
             
@@ -208,24 +285,40 @@ class CentralizedLogger:
             sys.__stderr__.write(abort_message)
             sys.__stderr__.flush()
             
+            # os._exit skips atexit, so persist buffered log records first
+            self.buffer_handler.flush()
+            
             # Force immediate exit
             os._exit(1)
         
-        # Override logging to abort on warnings and errors
-        class AbortOnErrorHandler(logging.Handler):
-            def emit(self, record):
+        self._abort = INSTANT_ABORT
+        
+        # Override logging to abort on warnings and errors. Logger filters
+        # are not consulted for records propagated from child loggers, so the
+        # filter sits on the console handler; the buffered file handler runs
+        # first and has already flushed the offending record.
+        class AbortFilter(logging.Filter):
+            def filter(self, record):
                 if record.levelno >= logging.WARNING:
                     INSTANT_ABORT(f"LOGGING {record.levelname}: {record.getMessage()}")
+                return True
         
-        self.logger.addHandler(AbortOnErrorHandler())
+        if strict:
+            self.console_handler.addFilter(AbortFilter())
         
         # Override warnings to abort
         def abort_on_warning(message, category, filename, lineno, file=None, line=None):
             INSTANT_ABORT(f"WARNING: {category.__name__}: {message} at {filename}:{lineno}")
         
-        warnings.showwarning = abort_on_warning
-        warnings.filterwarnings("error")  # Convert warnings to errors
-        warnings.simplefilter("error")  # Make all warnings errors
+        # The remaining hooks are process-wide; install them only once
+        global _ABORT_GUARDS_INSTALLED
+        if _ABORT_GUARDS_INSTALLED:
+            return
+        _ABORT_GUARDS_INSTALLED = True
+        
+        if strict:
+            warnings.showwarning = abort_on_warning
+            warnings.simplefilter("error")  # Make all warnings errors
         
         # Override exception handler to abort
         def abort_exception_handler(exc_type, exc_value, exc_traceback):
@@ -247,12 +340,20 @@ class CentralizedLogger:
         def abort_signal_handler(signum, frame):
             INSTANT_ABORT(f"SIGNAL RECEIVED: {signum}")
         
-        signal.signal(signal.SIGTERM, abort_signal_handler)
-        signal.signal(signal.SIGINT, abort_signal_handler)
+        # Leave handlers installed by the host application (Qt, pytest, ...) alone
+        default_handlers = {
+            signal.SIGTERM: signal.SIG_DFL,
+            signal.SIGINT: signal.default_int_handler,
+        }
+        for signum, default in default_handlers.items():
+            if signal.getsignal(signum) is default:
+                signal.signal(signum, abort_signal_handler)
         
         # Setup atexit handler
         def cleanup_handler():
             self.logger.info("Application shutting down")
+            self.buffer_handler.flush()
+            self.file_handler.close()
         
         atexit.register(cleanup_handler)
     
@@ -272,11 +373,14 @@ class CentralizedLogger:
             self.logger.critical(message)
         else:
             self.logger.error(message)
-        # The abort will happen automatically via the handler
+        self._abort(message)
 
 # Global logger instance
 _centralized_logger: Optional[CentralizedLogger] = None
 
+# Set once the process-wide abort hooks (warnings, excepthook, signals) are in place
+_ABORT_GUARDS_INSTALLED = False
+
 def setup_centralized_logging(log_file: str = "app.log") -> CentralizedLogger:
     """Setup centralized logging system."""
     global _centralized_logger
@@ -295,26 +399,55 @@ def setup_abort_on_warning_or_error(log_file: str = "app.log"):
     """Backward compatibility function that sets up centralized logging."""
     return setup_centralized_logging(log_file)
 
-# Backward compatibility - export settings as module-level variables
-def _export_settings():
-    """Export settings as module-level variables for backward compatibility"""
+# Backward compatibility - settings exposed as module-level variables.
+# Resolved lazily (PEP 562) so importing config does not build Settings.
+_LEGACY_EXPORTS = {
+    'DB_DIR': lambda s: str(s.db_path),
+    'LOG_DIR': lambda s: str(s.log_path),
+    'BINANCE_API_BASE_URL': lambda s: s.binance_api_base_url,
+    'MAX_KLINES': lambda s: s.max_klines,
+    'RATE_LIMIT_DELAY': lambda s: s.rate_limit_delay,
+    'SYMBOL': lambda s: s.symbol,
+    'INTERVAL': lambda s: s.interval,
+    'MAX_LAG': lambda s: s.max_lag,
+    'TOP_N': lambda s: s.top_n,
+    'LOOKBACK_DAYS': lambda s: s.lookback_days,
+    'RESULTS_CSV': lambda s: s.results_csv,
+    'COMPOSITE_CSV': lambda s: s.composite_csv,
+    'CORR_PLOT': lambda s: s.corr_plot,
+    'SIGNAL_PLOT': lambda s: s.signal_plot,
+}
+
+# (settings instance, resolved legacy values) for the current settings singleton
+_legacy_cache: tuple = (None, {})
+
+def _legacy_values() -> dict:
+    """Resolve all legacy exports once per settings instance."""
+    global _legacy_cache
     settings = get_settings()
-    globals().update({
-        'DB_DIR': str(settings.db_path),
-        'LOG_DIR': str(settings.log_path),
-        'BINANCE_API_BASE_URL': settings.binance_api_base_url,
-        'MAX_KLINES': settings.max_klines,
-        'RATE_LIMIT_DELAY': settings.rate_limit_delay,
-        'SYMBOL': settings.symbol,
-        'INTERVAL': settings.interval,
-        'MAX_LAG': settings.max_lag,
-        'TOP_N': settings.top_n,
-        'LOOKBACK_DAYS': settings.lookback_days,
-        'RESULTS_CSV': settings.results_csv,
-        'COMPOSITE_CSV': settings.composite_csv,
-        'CORR_PLOT': settings.corr_plot,
-        'SIGNAL_PLOT': settings.signal_plot,
-    })
+    cached_settings, values = _legacy_cache
+    if cached_settings is not settings:
+        values = {name: getter(settings) for name, getter in _LEGACY_EXPORTS.items()}
+        _legacy_cache = (settings, values)
+    return values
+
+__all__ = [
+    'PROJECT_ROOT',
+    'Settings',
+    'get_settings',
+    'CachedTimeFormatter',
+    'CentralizedLogger',
+    'setup_centralized_logging',
+    'get_logger',
+    'setup_abort_on_warning_or_error',
+    *_LEGACY_EXPORTS,
+]
+
+def __getattr__(name: str):
+    """Resolve legacy module-level settings on first access."""
+    if name in _LEGACY_EXPORTS:
+        return _legacy_values()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Initialize settings and export for backward compatibility
-_export_settings() 
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(_LEGACY_EXPORTS))
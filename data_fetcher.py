@@ -3,30 +3,83 @@ Async data fetcher for multiple sources with proper error handling and caching.
 """
 
 import asyncio
-from typing import Dict, List, Optional, Tuple
+import json
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 import yaml
 from pathlib import Path
 
 from config import get_settings, get_logger
-from fetchers import fetcher_registry
+from fetchers import get_fetcher_class
+from fetchers.base import BaseFetcher, SeriesCacheMixin
 
 logger = get_logger(__name__)
 
+# libyaml-backed loader when PyYAML was built with it; same semantics as SafeLoader
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=8)
+def _read_data_sources(path: Path, mtime_ns: int) -> Dict:
+    """
+    Parse the data sources YAML, going through a JSON sidecar when it is current.
+
+    Memoized per process on ``(path, mtime_ns)``, so every DataFetcher
+    shares one parsed config until the file changes; callers must treat the
+    returned dict as read-only.
+
+    The sidecar (``.<name>.json`` next to the YAML) records the YAML's
+    ``st_mtime_ns`` and is used only on an exact match, so edits, checkouts
+    and coarse filesystem timestamps all force a re-parse.
+    """
+    cache_path = path.with_name(f".{path.name}.json")
+    
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get("mtime_ns") == mtime_ns:
+            return cached["config"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass  # Missing, stale or corrupt sidecar: parse the YAML
+    
+    with open(path, 'r') as f:
+        config = yaml.load(f, Loader=_YAML_LOADER)
+    
+    try:
+        payload = json.dumps({"mtime_ns": mtime_ns, "config": config})
+        # Only cache configs that survive the JSON round trip unchanged
+        # (no dates, non-string keys, ...)
+        if json.loads(payload)["config"] == config:
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(payload, encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Not caching data sources as JSON: %s", e)
+    
+    return config
+
 class DataFetcher:
     """Main data fetcher that coordinates multiple sources."""
     
-    def __init__(self):
+    def __init__(self, concurrency: int = 8, keep_session: bool = False):
         self.settings = get_settings()
+        self.concurrency = concurrency
+        # Leave the shared HTTP session open after fetch_all, for callers
+        # that run every fetch on one long-lived event loop
+        self.keep_session = keep_session
         self.data_sources = self._load_data_sources()
+        # One fetcher per source for the duration of a fetch_all call, so
+        # per-fetcher resources are reused across series of the same source
+        self._fetchers: Dict[str, BaseFetcher] = {}
     
     def _load_data_sources(self) -> Dict:
         """Load data sources configuration from YAML file."""
         try:
-            with open(self.settings.data_sources_path, 'r') as f:
-                config = yaml.safe_load(f)
-            return config
+            path = self.settings.data_sources_path
+            return _read_data_sources(path, path.stat().st_mtime_ns)
         except Exception as e:
             logger.error(f"Failed to load data sources: {e}")
             return {"series": [], "defaults": {}}
@@ -39,7 +92,8 @@ class DataFetcher:
         self,
         start: Optional[datetime] = None,
         end: Optional[datetime] = None,
-        series_names: Optional[List[str]] = None
+        series_names: Optional[List[str]] = None,
+        on_series: Optional[Callable[[str, pd.Series], None]] = None
     ) -> pd.DataFrame:
         """
         Fetch data from all configured sources.
@@ -48,6 +102,8 @@ class DataFetcher:
             start: Start date for data fetching
             end: End date for data fetching
             series_names: Optional list of specific series to fetch
+            on_series: Optional callback invoked with ``(name, series)`` as
+                soon as each series arrives, before the others finish
             
         Returns:
             DataFrame with all series as columns
@@ -66,30 +122,59 @@ class DataFetcher:
             logger.warning("No series configured for fetching")
             return pd.DataFrame()
         
-        # Fetch data from all sources
+        series_configs = [s for s in series_configs if s.get("name") and s.get("source")]
+        
+        # Fetch data from all sources concurrently, bounded per source so
+        # each API sees at most `concurrency` requests in flight
+        semaphores = {
+            source: asyncio.BoundedSemaphore(self.concurrency)
+            for source in {s["source"] for s in series_configs}
+        }
+        
+        async def fetch_bounded(series_config: Dict) -> Optional[pd.Series]:
+            async with semaphores[series_config["source"]]:
+                series = await self._fetch_series(series_config, start, end)
+            if series is not None and on_series is not None:
+                on_series(series_config["name"], series)
+            return series
+        
+        try:
+            # return_exceptions keeps one failing series from discarding the others
+            fetched = await asyncio.gather(
+                *(fetch_bounded(s) for s in series_configs),
+                return_exceptions=True
+            )
+        finally:
+            # Sessions are bound to this event loop, so close them before it ends
+            await self._close_fetchers()
+        
         results = {}
-        for series_config in series_configs:
-            series_name = series_config.get("name")
-            source = series_config.get("source")
-            
-            if not series_name or not source:
-                continue
-            
-            result = await self._fetch_series(series_config, start, end)
-            if result is not None:
-                results[series_name] = result
+        for series_config, result in zip(series_configs, fetched):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to fetch {series_config['name']}: {result!r}")
+            elif result is not None:
+                results[series_config["name"]] = result
         
         if not results:
             logger.warning("No data fetched from any source")
             return pd.DataFrame()
         
-        # Combine all series into a DataFrame
-        df = pd.DataFrame(results)
+        # Combine all series into a DataFrame (outer join on dates)
+        df = pd.concat(results, axis=1)
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
         
-        # Align dates and handle missing values
-        df = df.fillna(method='ffill').fillna(method='bfill')
+        # Carry each series' last known value forward only. Back-filling
+        # would copy later observations into earlier dates (lookahead);
+        # no fill limit because monthly/annual series must span their period.
+        # With an unlimited forward fill the only all-NaN rows are those
+        # before the first observation, so trim them before filling instead
+        # of scanning and copying the filled frame again
+        observed = df.notna().to_numpy().any(axis=1)
+        first = int(observed.argmax()) if observed.any() else len(df)
+        df = df.iloc[first:].ffill()
         
-        logger.info(f"Successfully fetched {len(df.columns)} series with {len(df)} data points")
+        logger.info("Successfully fetched %d series with %d data points", len(df.columns), len(df))
         return df
     
     async def _fetch_series(
@@ -112,22 +197,26 @@ class DataFetcher:
         series_name = series_config.get("name")
         source = series_config.get("source")
         
-        logger.info(f"Fetching {series_name} from {source}")
+        logger.info("Fetching %s from %s", series_name, source)
         
         try:
             # Get appropriate fetcher
-            if source not in fetcher_registry:
-                logger.error(f"No fetcher found for source: {source}")
-                return None
-            
-            fetcher_class = fetcher_registry[source]
-            fetcher = fetcher_class()
+            fetcher = self._fetchers.get(source)
+            if fetcher is None:
+                fetcher_class = get_fetcher_class(source)
+                if fetcher_class is None:
+                    logger.error(f"No fetcher found for source: {source}")
+                    return None
+                fetcher = self._fetchers[source] = fetcher_class()
             
-            # Fetch data
-            series = await fetcher.fetch(start, end, **series_config)
+            # Fetch data, incrementally for fetchers with an on-disk cache
+            if isinstance(fetcher, SeriesCacheMixin):
+                series = await fetcher.fetch_cached(start, end, **series_config)
+            else:
+                series = await fetcher.fetch(start, end, **series_config)
             
             if series is not None and not series.empty:
-                logger.info(f"Successfully fetched {series_name}: {len(series)} data points")
+                logger.info("Successfully fetched %s: %d data points", series_name, len(series))
                 return series
             else:
                 logger.warning(f"No data returned for {series_name}")
@@ -137,6 +226,15 @@ class DataFetcher:
             logger.error(f"Failed to fetch {series_name}: {e}")
             return None
     
+    async def _close_fetchers(self) -> None:
+        """Close and forget the fetchers created during fetch_all, then the shared session."""
+        fetchers = list(self._fetchers.values())
+        self._fetchers.clear()
+        for fetcher in fetchers:
+            await fetcher.close()
+        if not self.keep_session:
+            await BaseFetcher.close_session()
+    
     def download(self) -> None:
         """Synchronous wrapper for fetch_all."""
         asyncio.run(self.fetch_all()) 
\ No newline at end of file
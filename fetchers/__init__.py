@@ -1,20 +1,48 @@
 """
 Data fetchers package.
+
+Fetcher modules are imported on first use, so importing the package does not
+pull in every third-party client library.
 """
 
-from .base import fetcher_registry, register_fetcher
-from .binance import BinanceFetcher
-from .trends import TrendsFetcher
-from .fred import FredFetcher
-from .yahoo import YahooFetcher
-from .fng import FearGreedFetcher
+import importlib
+from typing import Optional, Type
+
+from .base import BaseFetcher, fetcher_registry, register_fetcher
+
+# Source name -> (module, class) of the fetcher registered for it
+_FETCHERS = {
+    'binance': ('.binance', 'BinanceFetcher'),
+    'trends': ('.trends', 'TrendsFetcher'),
+    'fred': ('.fred', 'FredFetcher'),
+    'yahoo': ('.yahoo', 'YahooFetcher'),
+    'fng': ('.fng', 'FearGreedFetcher'),
+}
+_CLASS_MODULES = {name: module for module, name in _FETCHERS.values()}
+
+
+def get_fetcher_class(source: str) -> Optional[Type[BaseFetcher]]:
+    """Return the fetcher class for a source, importing its module if needed."""
+    if source not in fetcher_registry and source in _FETCHERS:
+        importlib.import_module(_FETCHERS[source][0], __name__)
+    return fetcher_registry.get(source)
+
+
+def __getattr__(name: str):
+    module = _CLASS_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
 
 __all__ = [
+    'BaseFetcher',
     'fetcher_registry',
+    'get_fetcher_class',
     'register_fetcher',
     'BinanceFetcher',
     'TrendsFetcher',
     'FredFetcher',
     'YahooFetcher',
     'FearGreedFetcher'
-] 
\ No newline at end of file
+]
@@ -3,20 +3,59 @@ Base fetcher class and registry for data sources.
 """
 
 import asyncio
+import json
+import os
+import re
+import time
+import warnings
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
 import aiohttp
+from yarl import URL
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from config import get_logger
+from config import get_settings, get_logger
 
 logger = get_logger(__name__)
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ujson
+    HAS_UJSON = True
+except ImportError:
+    HAS_UJSON = False
+
+# Decodes raw response bytes; orjson (or else ujson) is several times
+# faster than the stdlib on large numeric payloads
+if HAS_ORJSON:
+    _json_loads = orjson.loads
+elif HAS_UJSON:
+    _json_loads = ujson.loads
+else:
+    _json_loads = json.loads
+
+# Responses at least this large (a full 1000-kline page is ~190 KB) are
+# decoded in a worker thread instead of on the event loop; smaller ones
+# parse faster than the thread hand-off
+THREADED_DECODE_BYTES = 128 * 1024
+
 class BaseFetcher(ABC):
     """Abstract base class for data fetchers."""
     
+    # Keep-alive HTTP session shared by every fetcher, and the event loop it
+    # belongs to; see get_session()
+    _shared_session: Optional[aiohttp.ClientSession] = None
+    _shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+    
     def __init__(self, max_retries: int = 3, base_delay: float = 1.0):
         self.max_retries = max_retries
         self.base_delay = base_delay
@@ -41,31 +80,71 @@ class BaseFetcher(ABC):
         """
         pass
     
+    async def close(self) -> None:
+        """Release per-fetcher resources such as cache connections (no-op by default)."""
+    
+    @classmethod
+    async def get_session(cls) -> aiohttp.ClientSession:
+        """
+        Return the HTTP session shared by all fetchers, creating it on first use.
+        
+        One bounded connector with DNS caching lets requests to the same
+        host reuse warm connections across fetchers. A session is bound to
+        the event loop that created it, so a new one is made when called
+        from a different loop.
+        """
+        loop = asyncio.get_running_loop()
+        session = BaseFetcher._shared_session
+        if session is None or session.closed or BaseFetcher._shared_session_loop is not loop:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=90
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+            BaseFetcher._shared_session = session
+            BaseFetcher._shared_session_loop = loop
+        return session
+    
+    @classmethod
+    async def close_session(cls) -> None:
+        """Close the shared HTTP session; run on the loop that created it."""
+        session = BaseFetcher._shared_session
+        BaseFetcher._shared_session = None
+        BaseFetcher._shared_session_loop = None
+        if session is not None and not session.closed:
+            await session.close()
+    
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10)
     )
     async def _make_request(
         self, 
-        session: aiohttp.ClientSession, 
-        url: str, 
+        session: Optional[aiohttp.ClientSession], 
+        url: Union[str, URL], 
         params: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Make HTTP request with retry logic.
         
         Args:
-            session: aiohttp session
-            url: Request URL
+            session: aiohttp session, or None for the shared session
+            url: Request URL, as a string or pre-parsed yarl URL
             params: Query parameters
             
         Returns:
             JSON response data
         """
+        if session is None:
+            session = await self.get_session()
         try:
             async with session.get(url, params=params) as response:
                 response.raise_for_status()
-                return await response.json()
+                raw = await response.read()
+            if len(raw) >= THREADED_DECODE_BYTES:
+                return await asyncio.to_thread(_json_loads, raw)
+            return _json_loads(raw)
         except aiohttp.ClientError as e:
             logger.warning(f"Request failed: {e}, retrying...")
             raise
@@ -98,6 +177,150 @@ class BaseFetcher(ABC):
         # Remove any NaN values at the beginning
         return aligned.dropna()
 
+# path -> (st_mtime_ns, series) for series cache files already read
+_series_cache: Dict[Path, tuple] = {}
+
+def _load_cached_series(path: Path, mtime_ns: int) -> pd.Series:
+    """
+    Read a series cache file.
+    
+    Keeps the last read of each path in memory, so repeated fetches of the
+    same series skip the Parquet read until the file is rewritten; a newer
+    ``mtime_ns`` replaces the entry. Callers must treat the returned series
+    as read-only.
+    """
+    hit = _series_cache.get(path)
+    if hit is not None and hit[0] == mtime_ns:
+        return hit[1]
+    series = pd.read_parquet(path).iloc[:, 0]
+    _series_cache[path] = (mtime_ns, series)
+    return series
+
+class SeriesCacheMixin:
+    """
+    Incremental on-disk cache for fetchers whose series only grow at the end.
+    
+    Each series is kept as a zstd-compressed Parquet file in the database
+    directory, keyed by source, name and frequency, with recently read files
+    also held in memory. When the cache already covers the start of a
+    request, only the range after the last cached observation is downloaded
+    and appended. If ``series_cache_ttl`` is set, a cache whose last
+    observation is within one period of the requested end and that was
+    checked against the API within the TTL (file mtime) is served without
+    any request.
+    """
+    
+    # Sources whose responses are not comparable across requests (e.g. values
+    # rescaled per query window) set this to False: the whole window is then
+    # refetched on a cache miss and replaces the cache instead of extending it
+    incremental_cache: bool = True
+    
+    def _cache_path(self, source: str, name: str, freq: str) -> Path:
+        """Parquet cache file for one configured series."""
+        key = re.sub(r'[^A-Za-z0-9._-]+', '_', f"{source}_{name}_{freq}")
+        return get_settings().db_path / f"{key}.parquet"
+    
+    def _read_cached_series(self, path: Path) -> Optional[pd.Series]:
+        """Load a cached series, or None if it is missing or unreadable."""
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        try:
+            return _load_cached_series(path, mtime_ns)
+        except Exception as e:
+            logger.debug("Ignoring unreadable series cache %s: %s", path, e)
+            return None
+    
+    def _cache_is_fresh(self, path: Path) -> bool:
+        """Whether the cache was written or confirmed current within the TTL."""
+        ttl = get_settings().series_cache_ttl
+        if ttl <= 0:
+            return False
+        try:
+            return time.time() - path.stat().st_mtime < ttl
+        except OSError:
+            return False
+    
+    def _reaches_end(self, cached: pd.Series, end: datetime, freq: str) -> bool:
+        """Whether the last cached observation is within one period of ``end``."""
+        try:
+            with warnings.catch_warnings():
+                # Legacy aliases such as 'M' still work but warn on pandas 2.2+
+                warnings.simplefilter('ignore', FutureWarning)
+                period = to_offset(freq)
+        except ValueError:
+            period = pd.offsets.Day()
+        return cached.index[-1] + period >= pd.Timestamp(end)
+    
+    def _touch_cache(self, path: Path) -> None:
+        """Mark the cache as checked now without rewriting it."""
+        try:
+            os.utime(path)
+        except OSError as e:
+            logger.debug("Could not touch series cache %s: %s", path, e)
+    
+    def _write_cached_series(self, path: Path, series: pd.Series) -> None:
+        """Atomically replace the cache file with ``series``."""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        series.rename('value').to_frame().to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+    
+    async def fetch_cached(self, start: datetime, end: datetime, **kwargs: Any) -> pd.Series:
+        """
+        ``fetch`` through the incremental cache.
+        
+        Expects the series config (``source``, ``name``, optional ``freq``)
+        in ``kwargs``; without them this is a plain ``fetch``.
+        """
+        source, name = kwargs.get('source'), kwargs.get('name')
+        if not source or not name:
+            return await self.fetch(start, end, **kwargs)
+        
+        freq = kwargs.get('freq', 'D')
+        path = self._cache_path(source, name, freq)
+        cached = self._read_cached_series(path)
+        
+        fetch_start, fetch_end = start, end
+        if cached is not None and not cached.empty:
+            if cached.index[0] <= start:
+                if cached.index[-1] + timedelta(days=1) >= end:
+                    return cached.loc[start:end].copy()
+                # The TTL only covers a cache that is current up to the request
+                if self._reaches_end(cached, end, freq) and self._cache_is_fresh(path):
+                    return cached.loc[start:end].copy()
+                if self.incremental_cache:
+                    # Head is cached: only the tail after the last observation
+                    # is missing. Fetch from there even when the request starts
+                    # later, so the appended range never leaves a gap.
+                    fetch_start = cached.index[-1] + timedelta(days=1)
+            elif self.incremental_cache:
+                # Request starts before the cache: refetch through the cached
+                # tail so the merged series stays contiguous
+                fetch_end = max(end, cached.index[-1])
+        
+        new = await self.fetch(fetch_start, fetch_end, **kwargs)
+        if new is None or new.empty:
+            if cached is not None:
+                if not cached.empty and self._reaches_end(cached, end, freq):
+                    # Nothing newer yet; restart the freshness window
+                    self._touch_cache(path)
+                return cached.loc[start:end].copy()
+            return new
+        
+        if self.incremental_cache and cached is not None and not cached.empty:
+            combined = pd.concat([cached, new])
+            combined = combined[~combined.index.duplicated(keep='last')].sort_index()
+        else:
+            combined = new.sort_index()
+        
+        try:
+            self._write_cached_series(path, combined)
+        except Exception as e:
+            logger.debug("Could not write series cache %s: %s", path, e)
+        
+        return combined.loc[start:end].copy()
+
 # Registry for fetcher classes
 fetcher_registry: Dict[str, type] = {}
 
@@ -2,18 +2,125 @@
 Binance data fetcher with async support.
 """
 
+import os
 import sqlite3
 import asyncio
+from pathlib import Path
 from typing import Dict, Any, Optional
+from functools import cached_property
 from datetime import datetime, timedelta
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import aiohttp
+from yarl import URL
 from .base import BaseFetcher, register_fetcher
 from config import get_settings, get_logger
 import numpy as np
 
 logger = get_logger(__name__)
 
+# Kline interval lengths in milliseconds
+INTERVAL_MS = {
+    '1m': 60 * 1000,
+    '3m': 3 * 60 * 1000,
+    '5m': 5 * 60 * 1000,
+    '15m': 15 * 60 * 1000,
+    '30m': 30 * 60 * 1000,
+    '1h': 60 * 60 * 1000,
+    '2h': 2 * 60 * 60 * 1000,
+    '4h': 4 * 60 * 60 * 1000,
+    '6h': 6 * 60 * 60 * 1000,
+    '8h': 8 * 60 * 60 * 1000,
+    '12h': 12 * 60 * 60 * 1000,
+    '1d': 24 * 60 * 60 * 1000,
+    '3d': 3 * 24 * 60 * 60 * 1000,
+    '1w': 7 * 24 * 60 * 60 * 1000,
+    '1M': 30 * 24 * 60 * 60 * 1000
+}
+
+# Cache range query; sqlite3 keeps it prepared per connection
+_RANGE_QUERY = '''
+    SELECT timestamp, close 
+    FROM klines 
+    WHERE timestamp BETWEEN ? AND ?
+    ORDER BY timestamp
+'''
+
+# OHLCV columns stored alongside the open time
+KLINE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class ParquetKlineCache:
+    """
+    Kline cache kept as monthly Parquet partitions.
+    
+    Files live under ``root/<symbol>/<interval>/<YYYY-MM>.parquet`` and hold
+    the open time in epoch milliseconds plus the OHLCV columns. Reads load
+    only the months overlapping the requested range; writes rewrite only
+    the months they touch.
+    """
+    
+    def __init__(self, root: Path, symbol: str, interval: str):
+        self.directory = root / symbol / interval
+    
+    def _partition(self, month: np.datetime64) -> Path:
+        """Partition file for one ``datetime64[M]`` month."""
+        return self.directory / f"{month}.parquet"
+    
+    @staticmethod
+    def _months(timestamps_ms: np.ndarray) -> np.ndarray:
+        """Calendar month of each epoch-millisecond timestamp."""
+        return timestamps_ms.astype('datetime64[ms]').astype('datetime64[M]')
+    
+    def read(self, start_ts: int, end_ts: int) -> Optional[pd.Series]:
+        """Close prices with open time in ``[start_ts, end_ts]``, or None if none are cached."""
+        first, last = self._months(np.array([start_ts, end_ts], dtype=np.int64))
+        paths = [self._partition(month) for month in np.arange(first, last + 1)]
+        tables = [pq.read_table(path, columns=['timestamp', 'close']) for path in paths if path.exists()]
+        if not tables:
+            return None
+        
+        table = pa.concat_tables(tables)
+        timestamps = table.column('timestamp').to_numpy()
+        in_range = (timestamps >= start_ts) & (timestamps <= end_ts)
+        if not in_range.any():
+            return None
+        
+        index = pd.to_datetime(timestamps[in_range], unit='ms').rename('datetime')
+        return pd.Series(table.column('close').to_numpy()[in_range], index=index, name='close')
+    
+    def write(self, timestamps_ms: np.ndarray, values: np.ndarray) -> None:
+        """Merge sorted klines (``values`` columns as KLINE_COLUMNS) into their months."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        months = self._months(timestamps_ms)
+        
+        for month in np.unique(months):
+            in_month = months == month
+            timestamps, rows = timestamps_ms[in_month], values[in_month]
+            
+            # New klines replace cached ones with the same open time, so the
+            # still-open last candle is refreshed
+            path = self._partition(month)
+            if path.exists():
+                cached = pq.read_table(path)
+                cached_timestamps = cached.column('timestamp').to_numpy()
+                keep = ~np.isin(cached_timestamps, timestamps)
+                cached_rows = np.column_stack([cached.column(c).to_numpy() for c in KLINE_COLUMNS])
+                timestamps = np.concatenate([cached_timestamps[keep], timestamps])
+                rows = np.concatenate([cached_rows[keep], rows])
+                order = np.argsort(timestamps, kind='stable')
+                timestamps, rows = timestamps[order], rows[order]
+            
+            table = pa.table({
+                'timestamp': timestamps,
+                **{column: rows[:, i] for i, column in enumerate(KLINE_COLUMNS)}
+            })
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            pq.write_table(table, tmp_path, compression='zstd')
+            os.replace(tmp_path, path)
+
+
 @register_fetcher("binance")
 class BinanceFetcher(BaseFetcher):
     """Fetcher for Binance market data."""
@@ -22,17 +129,45 @@ class BinanceFetcher(BaseFetcher):
         super().__init__()
         self.settings = get_settings()
         self.base_url = self.settings.binance_api_base_url
+        # Parsed once; aiohttp uses a URL object as is instead of re-parsing
+        # the string for every window request
+        self._klines_url = URL(self.base_url)
         self.rate_limit_delay = self.settings.rate_limit_delay
+        self.max_concurrent_requests = self.settings.max_concurrent_requests
         self.max_klines = self.settings.max_klines
         
-        # Database setup
+        # Cache database; opened and set up on first use of ``conn``. Cache
+        # I/O runs in worker threads, one operation at a time
         self.db_path = self.settings.db_path / f"{self.settings.symbol}_{self.settings.interval}.db"
-        self._setup_database()
+        self._db_lock = asyncio.Lock()
+        
+        # Monthly Parquet partitions replace the SQLite cache when enabled
+        self.use_parquet_cache = self.settings.use_parquet_cache
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database with write-friendly pragmas."""
+        # Not bound to the creating thread so cache I/O can be off-loaded
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL avoids an fsync of the rollback journal per transaction;
+        # NORMAL sync is durable enough for a re-fetchable cache
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-65536')
+        # Serve cache reads from the OS page cache via a 256 MiB mapping
+        conn.execute('PRAGMA mmap_size=268435456')
+        return conn
+    
+    @cached_property
+    def conn(self) -> sqlite3.Connection:
+        """Cache connection, opened and set up on first use."""
+        conn = self._connect()
+        self._setup_database(conn)
+        return conn
     
-    def _setup_database(self):
+    def _setup_database(self, conn: sqlite3.Connection):
         """Setup SQLite database for caching."""
         try:
-            conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -46,13 +181,20 @@ class BinanceFetcher(BaseFetcher):
                 )
             ''')
             
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_timestamp ON klines(timestamp)')
+            # The INTEGER PRIMARY KEY is the rowid, so the table itself is
+            # keyed on timestamp; drop the duplicate index older caches have
+            cursor.execute('DROP INDEX IF EXISTS idx_timestamp')
             conn.commit()
-            conn.close()
             
         except Exception as e:
             logger.error(f"Failed to setup database: {e}")
     
+    async def close(self) -> None:
+        """Close the cache connection."""
+        conn = self.__dict__.pop('conn', None)
+        if conn is not None:
+            conn.close()
+    
     async def fetch(
         self, 
         start: datetime, 
@@ -77,9 +219,10 @@ class BinanceFetcher(BaseFetcher):
         interval = interval or self.settings.interval
         
         # Check cache first
-        cached_data = self._read_from_cache(start, end, symbol, interval)
+        async with self._db_lock:
+            cached_data = await asyncio.to_thread(self._read_from_cache, start, end, symbol, interval)
         if cached_data is not None and not cached_data.empty:
-            logger.info(f"Using cached Binance data for {symbol}")
+            logger.info("Using cached Binance data for %s", symbol)
             return cached_data
         
         # Fetch from API
@@ -94,29 +237,20 @@ class BinanceFetcher(BaseFetcher):
     ) -> Optional[pd.Series]:
         """Read data from local cache."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            
             start_ts = int(start.timestamp() * 1000)
             end_ts = int(end.timestamp() * 1000)
             
-            query = '''
-                SELECT timestamp, close 
-                FROM klines 
-                WHERE timestamp BETWEEN ? AND ?
-                ORDER BY timestamp
-            '''
+            if self.use_parquet_cache:
+                return self._parquet_cache(symbol, interval).read(start_ts, end_ts)
             
-            df = pd.read_sql_query(query, conn, params=(start_ts, end_ts))
-            conn.close()
-            
-            if df.empty:
+            rows = self.conn.execute(_RANGE_QUERY, (start_ts, end_ts)).fetchall()
+            if not rows:
                 return None
             
-            # Convert timestamp to datetime
-            df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('datetime', inplace=True)
-            
-            return df['close']
+            # Read straight into typed columns instead of a generic DataFrame
+            data = np.array(rows, dtype=[('timestamp', 'i8'), ('close', 'f8')])
+            index = pd.to_datetime(data['timestamp'], unit='ms').rename('datetime')
+            return pd.Series(data['close'], index=index, name='close')
             
         except Exception as e:
             logger.warning(f"Failed to read from database: {e}")
@@ -131,114 +265,127 @@ class BinanceFetcher(BaseFetcher):
     ) -> pd.Series:
         """Fetch data from Binance API."""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Calculate timestamps
-                start_ts = int(start.timestamp() * 1000)
-                end_ts = int(end.timestamp() * 1000)
-                
-                # Fetch data in chunks
-                all_klines = []
-                current_start = start_ts
-                
-                while current_start < end_ts:
-                    params = {
-                        'symbol': symbol,
-                        'interval': interval,
-                        'startTime': current_start,
-                        'endTime': min(current_start + (self.max_klines * self._get_interval_ms(interval)), end_ts),
-                        'limit': self.max_klines
-                    }
-                    
-                    data = await self._make_request(session, self.base_url, params)
-                    
-                    if not data:
-                        break
-                    
-                    all_klines.extend(data)
-                    
-                    # Update start time for next request
-                    if len(data) < self.max_klines:
-                        break
-                    
-                    current_start = data[-1][0] + 1
-                    
-                    # Rate limiting
-                    await asyncio.sleep(self.rate_limit_delay)
-                
-                if not all_klines:
-                    return pd.Series()
-                
-                # Convert to DataFrame
-                df = pd.DataFrame(all_klines, columns=[
-                    'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                    'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                    'taker_buy_quote', 'ignore'
-                ])
-                
-                # Convert types
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df['close'] = df['close'].astype(float)
-                
-                # Set index and return close prices
-                df.set_index('timestamp', inplace=True)
-                
-                # Store in cache
-                self._store_in_cache(df, symbol, interval)
-                
-                return df['close']
+            # Calculate timestamps
+            start_ts = int(start.timestamp() * 1000)
+            end_ts = int(end.timestamp() * 1000)
+            
+            # Split the range into windows of max_klines candles. The windows
+            # are independent, so they are requested concurrently instead of
+            # paginating one response after another.
+            step = self.max_klines * self._get_interval_ms(interval)
+            windows = [
+                (window_start, min(window_start + step - 1, end_ts))
+                for window_start in range(start_ts, end_ts, step)
+            ]
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            session = await self.get_session()
+            
+            # A window that runs out of retries is skipped rather than
+            # failing the whole range
+            batches = await asyncio.gather(*(
+                self._fetch_window(session, semaphore, symbol, interval, window_start, window_end)
+                for window_start, window_end in windows
+            ), return_exceptions=True)
+            
+            # gather preserves window order, so the klines come out sorted
+            all_klines = []
+            for (window_start, window_end), batch in zip(windows, batches):
+                if isinstance(batch, Exception):
+                    logger.warning(
+                        "Skipping Binance window %d-%d for %s: %s",
+                        window_start, window_end, symbol, batch
+                    )
+                    continue
+                if isinstance(batch, BaseException):
+                    raise batch
+                all_klines.extend(batch)
+            
+            if not all_klines:
+                return pd.Series()
+            
+            # Parse open time and OHLCV straight into typed arrays; the
+            # trusted payload needs no per-column coercion
+            times = np.fromiter((k[0] for k in all_klines), dtype=np.int64, count=len(all_klines))
+            ohlcv = np.array([k[1:6] for k in all_klines], dtype=np.float64)
+            index = pd.to_datetime(times, unit='ms').rename('timestamp')
+            # Windows arrive in order, so duplicates can only be adjacent
+            unique = np.r_[True, np.diff(times) > 0]
+            
+            # Store in cache as a single float64 block
+            df = pd.DataFrame(
+                ohlcv[unique],
+                columns=KLINE_COLUMNS,
+                index=index[unique]
+            )
+            async with self._db_lock:
+                await asyncio.to_thread(self._store_in_cache, df, symbol, interval)
+            
+            return df['close']
                 
         except Exception as e:
             logger.error(f"Failed to fetch Binance data: {e}")
             return pd.Series()
     
+    async def _fetch_window(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        symbol: str,
+        interval: str,
+        window_start: int,
+        window_end: int
+    ) -> list:
+        """Fetch the klines of one [window_start, window_end] ms window."""
+        params = {
+            'symbol': symbol,
+            'interval': interval,
+            'startTime': window_start,
+            'endTime': window_end,
+            'limit': self.max_klines
+        }
+        async with semaphore:
+            data = await self._make_request(session, self._klines_url, params)
+            # Rate limiting: each slot rests before its next request, so at
+            # most max_concurrent_requests / rate_limit_delay requests per second
+            await asyncio.sleep(self.rate_limit_delay)
+        return data or []
+    
     def _store_in_cache(self, df: pd.DataFrame, symbol: str, interval: str):
         """Store data in local cache."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            
-            # Prepare data for insertion
-            cache_data = []
-            for timestamp, row in df.iterrows():
-                cache_data.append((
-                    int(timestamp.timestamp() * 1000),
-                    float(row['open']),
-                    float(row['high']),
-                    float(row['low']),
-                    float(row['close']),
-                    float(row['volume'])
-                ))
-            
-            # Insert or replace data
-            cursor = conn.cursor()
-            cursor.executemany('''
-                INSERT OR REPLACE INTO klines 
-                (timestamp, open, high, low, close, volume)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', cache_data)
+            # Epoch milliseconds straight from the int64 nanosecond index
+            timestamps_ms = df.index.asi8 // 1_000_000
+            values = df[KLINE_COLUMNS].to_numpy(dtype=np.float64)
             
-            conn.commit()
-            conn.close()
+            if self.use_parquet_cache:
+                self._parquet_cache(symbol, interval).write(timestamps_ms, values)
+                return
+            
+            # Convert each column to Python floats in one pass and stream the
+            # zipped rows to executemany; timestamps stay ints for the
+            # INTEGER key
+            cache_data = zip(timestamps_ms.tolist(), *values.T.tolist())
+            conn = self.conn
+            
+            # Insert or replace data in one transaction; REPLACE (not IGNORE)
+            # so the still-open last candle is refreshed on the next fetch.
+            # IMMEDIATE takes the write lock up front instead of upgrading a
+            # read lock mid-transaction, which can fail with SQLITE_BUSY
+            with conn:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.executemany('''
+                    INSERT OR REPLACE INTO klines 
+                    (timestamp, open, high, low, close, volume)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', cache_data)
             
         except Exception as e:
             logger.warning(f"Failed to store data in database: {e}")
     
+    def _parquet_cache(self, symbol: str, interval: str) -> ParquetKlineCache:
+        """Parquet partitions for one symbol and interval."""
+        return ParquetKlineCache(self.settings.db_path / "klines", symbol, interval)
+    
     def _get_interval_ms(self, interval: str) -> int:
         """Convert interval string to milliseconds."""
-        interval_map = {
-            '1m': 60 * 1000,
-            '3m': 3 * 60 * 1000,
-            '5m': 5 * 60 * 1000,
-            '15m': 15 * 60 * 1000,
-            '30m': 30 * 60 * 1000,
-            '1h': 60 * 60 * 1000,
-            '2h': 2 * 60 * 60 * 1000,
-            '4h': 4 * 60 * 60 * 1000,
-            '6h': 6 * 60 * 60 * 1000,
-            '8h': 8 * 60 * 60 * 1000,
-            '12h': 12 * 60 * 60 * 1000,
-            '1d': 24 * 60 * 60 * 1000,
-            '3d': 3 * 24 * 60 * 60 * 1000,
-            '1w': 7 * 24 * 60 * 60 * 1000,
-            '1M': 30 * 24 * 60 * 60 * 1000
-        }
-        return interval_map.get(interval, 24 * 60 * 60 * 1000)  # Default to 1d 
\ No newline at end of file
+        return INTERVAL_MS.get(interval, INTERVAL_MS['1d'])  # Default to 1d 
\ No newline at end of file
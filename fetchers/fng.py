@@ -6,14 +6,13 @@ import asyncio
 from typing import Dict, Any
 from datetime import datetime, timedelta
 import pandas as pd
-import aiohttp
-from .base import BaseFetcher, register_fetcher
+from .base import BaseFetcher, SeriesCacheMixin, register_fetcher
 from config import get_settings, get_logger
 
 logger = get_logger(__name__)
 
 @register_fetcher("fng")
-class FearGreedFetcher(BaseFetcher):
+class FearGreedFetcher(SeriesCacheMixin, BaseFetcher):
     """Fetcher for Fear & Greed Index data."""
     
     def __init__(self):
@@ -46,55 +45,45 @@ class FearGreedFetcher(BaseFetcher):
     ) -> pd.Series:
         """Fetch data from Fear & Greed Index API."""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Calculate number of days to fetch
-                days = (end - start).days
-                
-                params = {
-                    'limit': min(days, 365),  # API limit
-                    'format': 'json'
-                }
-                
-                data = await self._make_request(session, self.base_url, params)
-                
-                if not data or 'data' not in data:
-                    logger.warning("No Fear & Greed data found")
-                    return pd.Series()
-                
-                # Parse data points
-                data_points = []
-                for point in data['data']:
-                    try:
-                        date_str = point.get('timestamp')
-                        value_str = point.get('value')
-                        
-                        if date_str and value_str:
-                            date = datetime.strptime(date_str, '%Y-%m-%d')
-                            value = int(value_str)
-                            
-                            # Filter to requested date range
-                            if start <= date <= end:
-                                data_points.append({
-                                    'date': date,
-                                    'value': value
-                                })
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"Failed to parse Fear & Greed data point: {e}")
-                        continue
-                
-                if not data_points:
-                    logger.warning("No valid Fear & Greed data points found")
-                    return pd.Series()
-                
-                # Create DataFrame
-                df = pd.DataFrame(data_points)
-                df.set_index('date', inplace=True)
-                
-                # Sort by date
-                df.sort_index(inplace=True)
-                
-                return df['value']
-                
+            session = await self.get_session()
+            # Calculate number of days to fetch
+            days = (end - start).days
+            
+            params = {
+                'limit': min(days, 365),  # API limit
+                'format': 'json'
+            }
+            
+            data = await self._make_request(session, self.base_url, params)
+            
+            if not data or 'data' not in data:
+                logger.warning("No Fear & Greed data found")
+                return pd.Series()
+            
+            # Parse the whole response at once. Timestamps are epoch seconds
+            # by default; ISO dates ('%Y-%m-%d') are accepted as a fallback
+            points = pd.DataFrame(data['data'], columns=['timestamp', 'value'])
+            epoch = pd.to_numeric(points['timestamp'], errors='coerce')
+            dates = pd.to_datetime(epoch, unit='s', errors='coerce').fillna(
+                pd.to_datetime(points['timestamp'].where(epoch.isna()), format='%Y-%m-%d', errors='coerce')
+            )
+            series = pd.Series(
+                pd.to_numeric(points['value'], errors='coerce').to_numpy(),
+                index=pd.DatetimeIndex(dates, name='date'),
+                name='value'
+            )
+            
+            # Drop unparseable points and filter to requested date range
+            series = series[series.index.notna() & series.notna()]
+            series = series[(series.index >= start) & (series.index <= end)]
+            
+            if series.empty:
+                logger.warning("No valid Fear & Greed data points found")
+                return pd.Series()
+            
+            # The API lists newest first
+            return series.sort_index()
+            
         except Exception as e:
             logger.error(f"Failed to fetch Fear & Greed data: {e}")
             return pd.Series() 
\ No newline at end of file
@@ -6,14 +6,13 @@ import asyncio
 from typing import Dict, Any
 from datetime import datetime, timedelta
 import pandas as pd
-import aiohttp
-from .base import BaseFetcher, register_fetcher
+from .base import BaseFetcher, SeriesCacheMixin, register_fetcher
 from config import get_settings, get_logger
 
 logger = get_logger(__name__)
 
 @register_fetcher("fred")
-class FredFetcher(BaseFetcher):
+class FredFetcher(SeriesCacheMixin, BaseFetcher):
     """Fetcher for FRED economic data."""
     
     def __init__(self):
@@ -62,43 +61,41 @@ class FredFetcher(BaseFetcher):
             return pd.Series()
         
         try:
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    'series_id': series_id,
-                    'api_key': self.api_key,
-                    'file_type': 'json',
-                    'observation_start': start.strftime('%Y-%m-%d'),
-                    'observation_end': end.strftime('%Y-%m-%d'),
-                    'frequency': 'd'  # Daily frequency
-                }
-                
-                data = await self._make_request(session, self.base_url, params)
-                
-                if not data or 'observations' not in data:
-                    logger.warning(f"No data found for FRED series {series_id}")
-                    return pd.Series()
-                
-                # Convert to DataFrame
-                observations = data['observations']
-                df = pd.DataFrame(observations)
-                
-                if df.empty:
-                    logger.warning(f"No data found for FRED series {series_id}")
-                    return pd.Series()
-                
-                # Convert date and value columns
-                df['date'] = pd.to_datetime(df['date'])
-                df['value'] = pd.to_numeric(df['value'], errors='coerce')
-                
-                # Set index and return values
-                df.set_index('date', inplace=True)
-                series = df['value']
-                
-                # Remove any '.' values (FRED's way of indicating no data)
-                series = series[series != '.']
-                
-                return series
-                
+            session = await self.get_session()
+            params = {
+                'series_id': series_id,
+                'api_key': self.api_key,
+                'file_type': 'json',
+                'observation_start': start.strftime('%Y-%m-%d'),
+                'observation_end': end.strftime('%Y-%m-%d'),
+                'frequency': 'd'  # Daily frequency
+            }
+            
+            data = await self._make_request(session, self.base_url, params)
+            
+            if not data or 'observations' not in data:
+                logger.warning(f"No data found for FRED series {series_id}")
+                return pd.Series()
+            
+            # Convert to DataFrame
+            observations = data['observations']
+            df = pd.DataFrame(observations)
+            
+            if df.empty:
+                logger.warning(f"No data found for FRED series {series_id}")
+                return pd.Series()
+            
+            # Convert date and value columns
+            df['date'] = pd.to_datetime(df['date'])
+            df['value'] = pd.to_numeric(df['value'], errors='coerce')
+            
+            # Set index and return values
+            df.set_index('date', inplace=True)
+            
+            # FRED marks missing observations with '.', which to_numeric
+            # has already turned into NaN
+            return df['value'].dropna()
+            
         except Exception as e:
             logger.error(f"Failed to fetch FRED data for {series_id}: {e}")
             return pd.Series() 
\ No newline at end of file
@@ -2,52 +2,40 @@
 Google Trends fetcher with caching.
 """
 
-import pickle
-from pathlib import Path
-from typing import Dict, Any
+import asyncio
+import threading
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 import pandas as pd
 from pytrends.request import TrendReq
-from .base import BaseFetcher, register_fetcher
+from .base import BaseFetcher, SeriesCacheMixin, register_fetcher
 from config import get_settings, get_logger
 
 logger = get_logger(__name__)
 
 @register_fetcher("trends")
-class TrendsFetcher(BaseFetcher):
-    """Fetcher for Google Trends data with caching."""
+class TrendsFetcher(SeriesCacheMixin, BaseFetcher):
+    """
+    Fetcher for Google Trends data.
     
-    def __init__(self):
-        super().__init__()
-        self.settings = get_settings()
-        self.cache_dir = self.settings.log_path / "trends_cache"
-        self.cache_dir.mkdir(exist_ok=True)
-        
-        # Initialize pytrends
-        self.pytrends = TrendReq(hl='en-US', tz=360)
+    Results are cached per keyword series by SeriesCacheMixin. Google
+    rescales every response to 0-100 over its own window and picks the
+    sampling frequency from the window length, so responses cannot be
+    stitched together: a request the cache does not cover refetches the
+    whole window and replaces the cached series.
+    """
     
-    def _get_cache_path(self, keyword: str, start: datetime, end: datetime) -> Path:
-        """Get cache file path for the given parameters."""
-        start_str = start.strftime('%Y%m%d')
-        end_str = end.strftime('%Y%m%d')
-        filename = f"{keyword}_{start_str}_{end_str}.pkl"
-        return self.cache_dir / filename
+    incremental_cache = False
     
-    def _load_from_cache(self, cache_path: Path) -> pd.Series:
-        """Load data from cache file."""
-        try:
-            with open(cache_path, 'rb') as f:
-                return pickle.load(f)
-        except (FileNotFoundError, pickle.PickleError):
-            return None
+    # One pytrends client per process, created on first use: constructing
+    # it fetches Google cookies. Its calls block and keep the current
+    # payload on the instance, so they run one at a time in worker threads
+    _pytrends: Optional[TrendReq] = None
+    _pytrends_lock = threading.Lock()
     
-    def _save_to_cache(self, cache_path: Path, data: pd.Series) -> None:
-        """Save data to cache file."""
-        try:
-            with open(cache_path, 'wb') as f:
-                pickle.dump(data, f)
-        except Exception as e:
-            logger.warning(f"Failed to save trends cache: {e}")
+    def __init__(self):
+        super().__init__()
+        self.settings = get_settings()
     
     async def fetch(
         self, 
@@ -68,35 +56,21 @@ class TrendsFetcher(BaseFetcher):
             pandas Series with trends data
         """
         keyword = kw or kwargs.get('keyword', 'bitcoin')
-        
-        # Check cache first
-        cache_path = self._get_cache_path(keyword, start, end)
-        cached_data = self._load_from_cache(cache_path)
-        
-        if cached_data is not None and not cached_data.empty:
-            logger.info(f"Using cached trends data for {keyword}")
-            return cached_data
-        
-        # Fetch from API
-        return await self._fetch_from_api(start, end, keyword, cache_path)
+        return await self._fetch_from_api(start, end, keyword)
     
     async def _fetch_from_api(
         self, 
         start: datetime, 
         end: datetime, 
-        keyword: str,
-        cache_path: Path
+        keyword: str
     ) -> pd.Series:
         """Fetch data from Google Trends API."""
         try:
             # Build payload
             timeframe = f"{start.strftime('%Y-%m-%d')} {end.strftime('%Y-%m-%d')}"
             
-            # Build payload
-            self.pytrends.build_payload([keyword], cat=0, timeframe=timeframe, geo='', gprop='')
-            
-            # Get interest over time
-            data = self.pytrends.interest_over_time()
+            # Get interest over time without blocking the event loop
+            data = await asyncio.to_thread(self._interest_over_time, keyword, timeframe)
             
             if data.empty:
                 logger.warning(f"No trends data found for keyword: {keyword}")
@@ -106,14 +80,17 @@ class TrendsFetcher(BaseFetcher):
             series = data[keyword]
             
             # Filter to requested date range
-            series = series[(series.index >= start) & (series.index <= end)]
-            
-            # Cache the result
-            if not series.empty:
-                self._save_to_cache(cache_path, series)
-            
-            return series
+            return series[(series.index >= start) & (series.index <= end)]
             
         except Exception as e:
             logger.error(f"Failed to fetch trends data for {keyword}: {e}")
-            return pd.Series() 
\ No newline at end of file
+            return pd.Series() 
+    
+    def _interest_over_time(self, keyword: str, timeframe: str) -> pd.DataFrame:
+        """Blocking pytrends query for one keyword on the shared client."""
+        with TrendsFetcher._pytrends_lock:
+            if TrendsFetcher._pytrends is None:
+                TrendsFetcher._pytrends = TrendReq(hl='en-US', tz=360)
+            pytrends = TrendsFetcher._pytrends
+            pytrends.build_payload([keyword], cat=0, timeframe=timeframe, geo='', gprop='')
+            return pytrends.interest_over_time()
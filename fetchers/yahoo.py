@@ -3,17 +3,17 @@ Yahoo Finance fetcher.
 """
 
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
-import aiohttp
-from .base import BaseFetcher, register_fetcher
+from .base import BaseFetcher, SeriesCacheMixin, register_fetcher
 from config import get_settings, get_logger
 
 logger = get_logger(__name__)
 
 @register_fetcher("yahoo")
-class YahooFetcher(BaseFetcher):
+class YahooFetcher(SeriesCacheMixin, BaseFetcher):
     """Fetcher for Yahoo Finance data."""
     
     def __init__(self):
@@ -46,6 +46,45 @@ class YahooFetcher(BaseFetcher):
         
         return await self._fetch_from_api(start, end, symbol)
     
+    async def fetch_many(
+        self,
+        tickers: List[str],
+        start: datetime,
+        end: datetime,
+        max_concurrency: int = 8
+    ) -> Dict[str, pd.Series]:
+        """
+        Fetch several tickers concurrently.
+        
+        Args:
+            tickers: Stock ticker symbols
+            start: Start date
+            end: End date
+            max_concurrency: Maximum number of requests in flight
+            
+        Returns:
+            Mapping of ticker to price series; tickers that failed or
+            returned no data are left out
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch_bounded(ticker: str) -> pd.Series:
+            async with semaphore:
+                return await self.fetch(start, end, ticker)
+        
+        results = await asyncio.gather(
+            *(fetch_bounded(ticker) for ticker in tickers),
+            return_exceptions=True
+        )
+        
+        series = {}
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to fetch Yahoo data for {ticker}: {result!r}")
+            elif not result.empty:
+                series[ticker] = result
+        return series
+    
     async def _fetch_from_api(
         self, 
         start: datetime, 
@@ -54,57 +93,48 @@ class YahooFetcher(BaseFetcher):
     ) -> pd.Series:
         """Fetch data from Yahoo Finance API."""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Convert dates to timestamps
-                start_ts = int(start.timestamp())
-                end_ts = int(end.timestamp())
-                
-                url = f"{self.base_url}/{symbol}"
-                params = {
-                    'period1': start_ts,
-                    'period2': end_ts,
-                    'interval': '1d',
-                    'includePrePost': 'false',
-                    'events': 'div,split'
-                }
-                
-                data = await self._make_request(session, url, params)
-                
-                if not data or 'chart' not in data:
-                    logger.warning(f"No data found for Yahoo ticker {symbol}")
-                    return pd.Series()
-                
-                chart_data = data['chart']
-                if 'result' not in chart_data or not chart_data['result']:
-                    logger.warning(f"No data found for Yahoo ticker {symbol}")
-                    return pd.Series()
-                
-                result = chart_data['result'][0]
-                
-                # Extract timestamps and prices
-                timestamps = result.get('timestamp', [])
-                quote = result.get('indicators', {}).get('quote', [{}])[0]
-                close_prices = quote.get('close', [])
-                
-                if not timestamps or not close_prices:
-                    logger.warning(f"No price data found for Yahoo ticker {symbol}")
-                    return pd.Series()
-                
-                # Create DataFrame
-                df = pd.DataFrame({
-                    'timestamp': timestamps,
-                    'close': close_prices
-                })
-                
-                # Convert timestamp to datetime
-                df['date'] = pd.to_datetime(df['timestamp'], unit='s')
-                df.set_index('date', inplace=True)
-                
-                # Remove any NaN values
-                series = df['close'].dropna()
-                
-                return series
-                
+            session = await self.get_session()
+            # Convert dates to timestamps
+            start_ts = int(start.timestamp())
+            end_ts = int(end.timestamp())
+            
+            url = f"{self.base_url}/{symbol}"
+            params = {
+                'period1': start_ts,
+                'period2': end_ts,
+                'interval': '1d',
+                'includePrePost': 'false',
+                'events': 'div,split'
+            }
+            
+            data = await self._make_request(session, url, params)
+            
+            if not data or 'chart' not in data:
+                logger.warning(f"No data found for Yahoo ticker {symbol}")
+                return pd.Series()
+            
+            chart_data = data['chart']
+            if 'result' not in chart_data or not chart_data['result']:
+                logger.warning(f"No data found for Yahoo ticker {symbol}")
+                return pd.Series()
+            
+            result = chart_data['result'][0]
+            
+            # Extract timestamps and prices
+            timestamps = result.get('timestamp', [])
+            quote = result.get('indicators', {}).get('quote', [{}])[0]
+            close_prices = quote.get('close', [])
+            
+            if not timestamps or not close_prices:
+                logger.warning(f"No price data found for Yahoo ticker {symbol}")
+                return pd.Series()
+            
+            # Build the series straight on a DatetimeIndex; missing closes
+            # (null in the response) become NaN and are dropped
+            index = pd.to_datetime(np.asarray(timestamps, dtype=np.int64), unit='s').rename('date')
+            series = pd.Series(np.asarray(close_prices, dtype=np.float64), index=index, name='close')
+            return series.dropna()
+            
         except Exception as e:
             logger.error(f"Failed to fetch Yahoo data for {symbol}: {e}")
             return pd.Series() 
\ No newline at end of file
@@ -3,17 +3,25 @@ PyQt5 GUI for Crypto Signal Scanner
 """
 import sys
 import os
+import atexit
+import asyncio
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QPushButton,
     QVBoxLayout, QHBoxLayout, QTextEdit, QLabel, QFileDialog, QMessageBox, QComboBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 
 from data_fetcher import DataFetcher
+from fetchers.base import BaseFetcher
+from lttb import lttb_indices
 from signal_scanner import SignalScanner
 from config import setup_centralized_logging, get_logger
 
@@ -21,13 +29,76 @@ from config import setup_centralized_logging, get_logger
 setup_centralized_logging('gui.log')
 logger = get_logger(__name__)
 
+# Optional libuv-based event loop for the fetch runner (not available on Windows)
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+# Series shown in the GUI and the files they are saved to
+SERIES_FILES = {name: f'{name}.csv' for name in ['BTCUSDT', 'Fear & Greed', 'Bitcoin Trends']}
+
 class MplCanvas(FigureCanvas):
     def __init__(self, parent=None, width=5, height=4, dpi=100):
         self.fig, self.ax = plt.subplots(figsize=(width, height), dpi=dpi)
         super().__init__(self.fig)
         self.setParent(parent)
 
+class AsyncRunner(QThread):
+    """Runs one asyncio event loop in a background thread for the life of the process."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Created here rather than in run() so coroutines can be submitted
+        # before the thread has started
+        self.loop = uvloop.new_event_loop() if HAS_UVLOOP else asyncio.new_event_loop()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """Schedule a coroutine on the runner's loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        """Stop the loop and wait for the thread to finish."""
+        if self.loop.is_closed():
+            return
+        if self.isRunning():
+            # Fetches keep the shared HTTP session open between runs
+            try:
+                self.submit(BaseFetcher.close_session()).result(timeout=5)
+            except Exception as e:
+                logger.error(f"ERROR CLOSING HTTP SESSION: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.wait()
+        self.loop.close()
+
+_async_runner = None
+
+def get_async_runner():
+    """Return the process-wide AsyncRunner, starting it on first use."""
+    global _async_runner
+    if _async_runner is None:
+        _async_runner = AsyncRunner()
+        _async_runner.start()
+        # A QThread destroyed while running aborts the process
+        atexit.register(_async_runner.stop)
+    return _async_runner
+
 class MainWindow(QMainWindow):
+    # Emitted from the runner thread; Qt queues delivery onto the GUI thread
+    fetch_done = pyqtSignal(object)
+    # (name, series) for each series as soon as its fetch completes
+    series_ready = pyqtSignal(str, object)
+    # Error messages from worker threads, shown on the GUI thread
+    error = pyqtSignal(str)
+    # Emitted by the scan thread when it finishes; True on success
+    scan_done = pyqtSignal(bool)
+    # Reused by every load_existing_data call; threads start on demand
+    _load_pool = ThreadPoolExecutor(max_workers=min(8, len(SERIES_FILES)), thread_name_prefix='gui-load')
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle('Crypto Signal Scanner')
@@ -77,11 +148,29 @@ class MainWindow(QMainWindow):
         # Connections
         self.fetch_btn.clicked.connect(self.start_fetch)
         self.scan_btn.clicked.connect(self.start_scan)
+        self.fetch_done.connect(self.on_fetch_done)
+        self.error.connect(self.on_error)
+        self.scan_done.connect(self.on_scan_done)
+        self.series_ready.connect(self.on_series_ready)
+
+        # Coalesce rapid dropdown changes (e.g. arrow-key navigation) into
+        # one replot once the selection settles
+        self._replot_timer = QTimer(self)
+        self._replot_timer.setSingleShot(True)
+        self._replot_timer.setInterval(80)
+        self._replot_timer.timeout.connect(self.plot_selected_series)
 
         # Data storage for plotting
         self.series_data = {}
         self.composite = None
         self.top_corr = None
+        # path -> (st_mtime_ns, DataFrame) for data files already read
+        self._file_cache = {}
+        # Top-correlation bar heights and the bars last drawn from them
+        self._bar_heights = None
+        self._bar_artists = None
+        # Line reused by plot_series while it is still on canvas1
+        self._series_line = None
         
         # Try to load existing data on startup
         self.load_existing_data()
@@ -90,39 +179,104 @@ class MainWindow(QMainWindow):
         self.log_box.append(msg)
         logger.info(msg)
 
+    def on_error(self, msg):
+        """Report a failure in the log box and keep the window running"""
+        self.log_box.append(msg)
+        logger.error(msg)
+
+    def _cached_read(self, path, reader):
+        """Call reader(path), reusing the last result while the file's mtime is unchanged"""
+        mtime = os.stat(path).st_mtime_ns
+        hit = self._file_cache.get(path)
+        if hit is not None and hit[0] == mtime:
+            return hit[1].copy()
+        df = reader(path)
+        self._file_cache[path] = (mtime, df)
+        return df.copy()
+
+    @staticmethod
+    def _read_time_series_csv(path):
+        """Read a date-indexed CSV with Arrow's multithreaded parser"""
+        df = pd.read_csv(path, index_col=0, parse_dates=True, engine='pyarrow')
+        # Arrow infers date-only columns as datetime.date objects
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df.index = pd.to_datetime(df.index, format='ISO8601')
+        return df
+
+    @staticmethod
+    def _read_table_csv(path):
+        """Read an unindexed CSV with Arrow's multithreaded parser"""
+        return pd.read_csv(path, engine='pyarrow')
+
+    def _load_series(self, filename, present, indexed=True):
+        """
+        Load a saved frame from its CSV or Parquet copy, whichever is newer.
+
+        ``present`` maps file names to ``st_mtime_ns``, so a copy left over
+        from an earlier run in the other format never hides newer results.
+        Returns None when neither file is in ``present``.
+        """
+        parquet = os.path.splitext(filename)[0] + '.parquet'
+        if parquet in present and present[parquet] >= present.get(filename, -1):
+            return self._cached_read(parquet, pd.read_parquet)
+        if filename in present:
+            reader = self._read_time_series_csv if indexed else self._read_table_csv
+            return self._cached_read(filename, reader)
+        return None
+
     def load_existing_data(self):
         """Load existing data files if they exist"""
         try:
-            import pandas as pd
-            import os
-            
             # Clear existing data
             self.series_data = {}
             
+            # One directory listing instead of a lookup per candidate file
+            present = {
+                e.name: e.stat().st_mtime_ns for e in os.scandir('.')
+                if e.name.endswith(('.csv', '.parquet'))
+            }
+            
             # Load composite signal if available
-            if os.path.exists('composite_signal.csv'):
-                comp = pd.read_csv('composite_signal.csv', index_col=0, parse_dates=True)
-                self.composite = comp.squeeze()
+            comp = self._load_series('composite_signal.csv', present)
+            if comp is not None:
+                self.composite = comp.iloc[:, 0]
                 self.log('Loaded existing composite signal')
             
             # Load top correlations if available
-            if os.path.exists('results.csv'):
-                top_corr = pd.read_csv('results.csv')
-                self.top_corr = top_corr
-                self.log('Loaded existing top correlations')
+            top_corr = self._load_series('results.csv', present, indexed=False)
+            if top_corr is not None:
+                # Older results.csv files name the column 'corr'
+                column = 'correlation' if 'correlation' in top_corr.columns else 'corr'
+                if column in top_corr.columns:
+                    self.top_corr = top_corr
+                    self._bar_heights = top_corr[column].head(10).to_numpy()
+                    self.log('Loaded existing top correlations')
+                else:
+                    self.on_error('ERROR LOADING TOP CORRELATIONS: results.csv has no correlation column')
             
-            # Load individual series data
-            for name in ['BTCUSDT', 'Fear & Greed', 'Bitcoin Trends']:
+            # Load individual series data in parallel; the readers release
+            # the GIL while parsing. Failures are collected and logged once.
+            errors = []
+            futures = {
+                self._load_pool.submit(self._load_series, filename, present): name
+                for name, filename in SERIES_FILES.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
                 try:
-                    if os.path.exists(f'{name}.csv'):
-                        series = pd.read_csv(f'{name}.csv', index_col=0, parse_dates=True)
-                        self.series_data[name] = series.squeeze()
-                        self.log(f'Loaded existing {name} data')
+                    series = future.result()
                 except Exception as e:
-                    logger.error(f"ERROR LOADING SERIES {name}: {e}")
+                    errors.append(f"{name}: {e}")
+                    continue
+                if series is not None:
+                    self.series_data[name] = series.iloc[:, 0]
+                    self._add_series_item(name)
+                    self.log(f'Loaded existing {name} data')
+            if errors:
+                self.on_error(f"ERROR LOADING SERIES: {'; '.join(errors)}")
                     
         except Exception as e:
-            logger.error(f"ERROR LOADING EXISTING DATA: {e}")
+            self.on_error(f"ERROR LOADING EXISTING DATA: {e}")
 
     def start_fetch(self):
         """Start data fetching process"""
@@ -130,27 +284,39 @@ class MainWindow(QMainWindow):
             self.log('Starting data fetch...')
             self.fetch_btn.setEnabled(False)
             
-            # Create data fetcher and fetch data
-            fetcher = DataFetcher()
-            
-            # Run in background thread
-            import threading
-            def fetch_thread():
-                try:
-                    # This would normally be async, but for GUI we'll run sync
-                    # In a real implementation, you'd use QThread or asyncio
-                    self.log('Data fetch completed')
-                    self.fetch_btn.setEnabled(True)
-                except Exception as e:
-                    logger.error(f"ERROR STARTING FETCH: {e}")
-                    self.fetch_btn.setEnabled(True)
-            
-            thread = threading.Thread(target=fetch_thread)
-            thread.daemon = True
-            thread.start()
+            # Run the async fetch on the shared event loop thread so all
+            # series are fetched concurrently without blocking the GUI
+            future = get_async_runner().submit(
+                DataFetcher(keep_session=True).fetch_all(on_series=self.series_ready.emit)
+            )
+            future.add_done_callback(self.fetch_done.emit)
             
         except Exception as e:
-            logger.error(f"ERROR STARTING FETCH: {e}")
+            self.on_error(f"ERROR STARTING FETCH: {e}")
+            self.fetch_btn.setEnabled(True)
+
+    def on_series_ready(self, name, series):
+        """Record a series as soon as it arrives, ahead of the full fetch"""
+        self.series_data[name] = series
+        self._add_series_item(name)
+        self.log(f'Fetched {name}: {len(series)} points')
+        # Redraw (debounced) if this series is the one on display
+        if name == self.series_dropdown.currentText():
+            self._replot_timer.start()
+
+    def _add_series_item(self, name):
+        """Make a series selectable in the plot dropdown"""
+        if self.series_dropdown.findText(name) < 0:
+            self.series_dropdown.addItem(name)
+
+    def on_fetch_done(self, future):
+        """Handle fetch completion on the GUI thread"""
+        try:
+            df = future.result()
+            self.log(f'Data fetch completed: {len(df.columns)} series, {len(df)} rows')
+        except Exception as e:
+            self.on_error(f"ERROR FETCHING DATA: {e}")
+        finally:
             self.fetch_btn.setEnabled(True)
 
     def start_scan(self):
@@ -163,29 +329,41 @@ class MainWindow(QMainWindow):
             scanner = SignalScanner()
             
             # Run in background thread
-            import threading
             def scan_thread():
+                # Widgets belong to the GUI thread: report back through
+                # signals and let the slots update them
                 try:
                     # This would normally be async, but for GUI we'll run sync
                     # In a real implementation, you'd use QThread or asyncio
-                    self.log('Signal scan completed')
-                    self.scan_btn.setEnabled(True)
-                    self.load_existing_data()  # Reload data after scan
+                    self.scan_done.emit(True)
                 except Exception as e:
-                    logger.error(f"ERROR STARTING SCAN: {e}")
-                    self.scan_btn.setEnabled(True)
+                    self.error.emit(f"ERROR STARTING SCAN: {e}")
+                    self.scan_done.emit(False)
             
             thread = threading.Thread(target=scan_thread)
             thread.daemon = True
             thread.start()
             
         except Exception as e:
-            logger.error(f"ERROR STARTING SCAN: {e}")
+            self.on_error(f"ERROR STARTING SCAN: {e}")
             self.scan_btn.setEnabled(True)
 
+    def on_scan_done(self, ok):
+        """Handle scan completion on the GUI thread"""
+        self.scan_btn.setEnabled(True)
+        if ok:
+            self.log('Signal scan completed')
+            self.load_existing_data()  # Reload data after scan
+
     def on_series_selected(self, index):
         """Handle series selection for plotting"""
+        # Restarting the single-shot timer drops any pending replot
+        self._replot_timer.start()
+
+    def plot_selected_series(self):
+        """Plot whatever the dropdown currently selects"""
         try:
+            index = self.series_dropdown.currentIndex()
             if index == 0:  # Composite Signal
                 if self.composite is not None:
                     self.plot_series(self.composite, 'Composite Signal')
@@ -196,36 +374,68 @@ class MainWindow(QMainWindow):
                     self.plot_correlations()
                 else:
                     self.log('No correlation data available')
+            else:  # Individual series
+                name = self.series_dropdown.currentText()
+                series = self.series_data.get(name)
+                if series is not None:
+                    self.plot_series(series, name)
+                else:
+                    self.log(f'No {name} data available')
         except Exception as e:
-            logger.error(f"PLOTTING ERROR: {e}")
+            self.on_error(f"PLOTTING ERROR: {e}")
 
     def plot_series(self, series, title):
         """Plot a time series"""
         try:
-            self.canvas1.ax.clear()
-            series.plot(ax=self.canvas1.ax)
-            self.canvas1.ax.set_title(title)
-            self.canvas1.ax.grid(True)
-            self.canvas1.draw()
+            ax = self.canvas1.ax
+            # Agg rasterizes every segment, so keep ~2 points per pixel
+            target = 2 * self.canvas1.width()
+            if len(series) > 2 * target:
+                series = series.dropna()
+                x = (series.index.asi8 if isinstance(series.index, pd.DatetimeIndex)
+                     else np.arange(len(series)))
+                series = series.iloc[lttb_indices(x, series.to_numpy(), target)]
+            line = self._series_line
+            if line is not None and line.axes is ax:
+                # Swap the data on the existing line rather than clearing
+                # and rebuilding the axes
+                line.set_data(series.index, series.to_numpy())
+                ax.relim()
+                ax.autoscale_view()
+            else:
+                ax.clear()
+                self._series_line, = ax.plot(series.index, series.to_numpy())
+                ax.grid(True)
+            ax.set_title(title)
+            self.canvas1.draw_idle()
         except Exception as e:
-            logger.error(f"PLOTTING ERROR: {e}")
+            self.on_error(f"PLOTTING ERROR: {e}")
 
     def plot_correlations(self):
         """Plot correlation data"""
         try:
-            self.canvas1.ax.clear()
             # Simple bar plot of top correlations
             if not self.top_corr.empty:
-                top_n = min(10, len(self.top_corr))
-                top_data = self.top_corr.head(top_n)
-                self.canvas1.ax.bar(range(len(top_data)), top_data['correlation'])
-                self.canvas1.ax.set_title('Top Correlations')
-                self.canvas1.ax.set_xlabel('Rank')
-                self.canvas1.ax.set_ylabel('Correlation')
-                self.canvas1.ax.grid(True)
-                self.canvas1.draw()
+                ax = self.canvas1.ax
+                heights = self._bar_heights
+                bars = self._bar_artists
+                # Bars still on the axes (not cleared by another plot) are
+                # updated in place instead of rebuilding every artist
+                if bars is not None and len(bars) == len(heights) and bars[0].axes is ax:
+                    for rect, height in zip(bars, heights):
+                        rect.set_height(height)
+                    ax.relim()
+                    ax.autoscale_view()
+                else:
+                    ax.clear()
+                    self._bar_artists = ax.bar(range(len(heights)), heights)
+                    ax.set_title('Top Correlations')
+                    ax.set_xlabel('Rank')
+                    ax.set_ylabel('Correlation')
+                    ax.grid(True)
+                self.canvas1.draw_idle()
         except Exception as e:
-            logger.error(f"PLOTTING ERROR: {e}")
+            self.on_error(f"PLOTTING ERROR: {e}")
 
 def main():
     """Main GUI function"""
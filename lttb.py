@@ -0,0 +1,53 @@
+"""
+Largest-Triangle-Three-Buckets downsampling for plotting long series.
+"""
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Pick the points of a line that best preserve its visual shape.
+
+    The first and last points are always kept; the interior is split into
+    ``n_out - 2`` equal buckets and from each the point forming the largest
+    triangle with the previously kept point and the next bucket's mean is
+    chosen.
+
+    Args:
+        x: Monotonic x coordinates (e.g. ``DatetimeIndex.asi8``)
+        y: Values, without NaN
+        n_out: Number of points to keep
+
+    Returns:
+        Sorted int64 positions into ``x``/``y``; all positions when
+        ``n_out`` is not smaller than the input or is below 3.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n, dtype=np.int64)
+
+    # Bucket i covers [edges[i], edges[i + 1]); the last ends before the final point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0] = 0
+    picked[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        cx = x[next_lo:next_hi].mean()
+        cy = y[next_lo:next_hi].mean()
+        ax, ay = x[a], y[a]
+        # Twice the triangle area; the constant factor does not change the argmax
+        areas = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(areas.argmax())
+        picked[i + 1] = a
+
+    return picked
@@ -3,11 +3,17 @@ Vectorized signal scanner with proper statistical corrections and async support.
 """
 
 import asyncio
+import csv
+import io
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
-from concurrent.futures import ProcessPoolExecutor
+from scipy import fft as sp_fft
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import yaml
 from pathlib import Path
 
@@ -24,13 +30,218 @@ except ImportError:
     HAS_NUMBA = False
     logger.info("Numba not available - using standard numpy operations")
 
+# Minimum number of overlapping observations for a lagged correlation
+MIN_OVERLAP = 10
+
+# Above this many lags, FFT cross-correlation beats per-lag matrix products
+GEMM_MAX_LAGS = 64
+
+# Output formats accepted by SignalScanner.save_results
+RESULT_FORMATS = ('csv', 'parquet')
+
+
+def _write_frame(frame: pd.DataFrame, path: Path, fmt: str, index: bool = True) -> None:
+    """
+    Write a DataFrame through Arrow's C++ CSV/Parquet writers.
+
+    Parquet output is zstd-compressed, keeps the index in the pandas
+    metadata and replaces the file suffix with ``.parquet``. CSV output writes the index as the first
+    column, so ``pd.read_csv(path, index_col=0)`` round-trips it, and keeps
+    the layout of ``DataFrame.to_csv``: plain dates for a daily index, ISO
+    timestamps otherwise, and quotes only where a value needs them.
+    """
+    if fmt == 'parquet':
+        table = pa.Table.from_pandas(frame, preserve_index=index)
+        pq.write_table(table, path.with_suffix('.parquet'), compression='zstd')
+        return
+    dates = frame.index
+    if index:
+        frame = frame.rename_axis(dates.name or '').reset_index()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if index and isinstance(dates, pd.DatetimeIndex) and dates.tz is None:
+        # Arrow prints nanosecond timestamps; print what to_csv would
+        if (dates == dates.normalize()).all():
+            table = table.set_column(0, table.field(0).name, table.column(0).cast(pa.date32()))
+        elif (dates == dates.floor('s')).all():
+            table = table.set_column(0, table.field(0).name, table.column(0).cast(pa.timestamp('s')))
+
+    # Arrow quotes the header and every string, so write the header like
+    # to_csv and the values unquoted; values that contain a delimiter,
+    # quote or newline need quoting, which only pandas does selectively
+    header = io.StringIO()
+    csv.writer(header, lineterminator='\n').writerow(table.column_names)
+    body = io.BytesIO()
+    try:
+        pa_csv.write_csv(table, body, pa_csv.WriteOptions(include_header=False, quoting_style='none'))
+    except pa.ArrowInvalid:
+        frame.to_csv(path, index=False)
+        return
+    with open(path, 'wb') as f:
+        f.write(header.getvalue().encode())
+        f.write(body.getbuffer())
+
+
+def _standardize(values: np.ndarray) -> np.ndarray:
+    """
+    Z-score each series once for all pair/lag kernels.
+
+    Args:
+        values: Array of shape (time, series), NaN for missing observations
+
+    Returns:
+        C-contiguous float64 array of shape (series, time), one series per
+        row, NaN preserved. Constant series are centred but left unscaled.
+    """
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=0)
+    n_series = values.shape[1]
+    means = np.divide(np.where(valid, values, 0.0).sum(axis=0), counts,
+                      out=np.zeros(n_series), where=counts > 0)
+    centred = values - means
+    variances = np.divide(np.where(valid, centred * centred, 0.0).sum(axis=0), counts,
+                          out=np.zeros(n_series), where=counts > 0)
+    scale = np.sqrt(variances)
+    scale[scale == 0] = 1.0
+    return np.ascontiguousarray((centred / scale).T, dtype=np.float64)
+
+
+def _pearson_from_sums(n, sx, sy, sxx, syy, sxy) -> np.ndarray:
+    """Pearson correlation from pairwise window sums; NaN where undefined."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var_x = n * sxx - sx * sx
+        var_y = n * syy - sy * sy
+        # Round-off leaves constant windows with a tiny non-zero variance
+        defined = (n > MIN_OVERLAP) & (var_x > 1e-10 * n * sxx) & (var_y > 1e-10 * n * syy)
+        corr = (n * sxy - sx * sy) / np.sqrt(var_x * var_y)
+    return np.where(defined, np.clip(corr, -1.0, 1.0), np.nan)
+
+
+def _lagged_correlations(x: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Pearson correlation of every ordered series pair at lags 1..max_lag.
+
+    Missing values are excluded pairwise, matching ``pd.Series.corr``. The
+    windowed sums come from one set of matrix products per lag for short
+    lag ranges and from FFT cross-correlations (whose cost does not grow
+    with the number of lags) otherwise.
+
+    Args:
+        x: Standardized array of shape (series, time) from ``_standardize``
+        max_lag: Maximum lag to evaluate
+
+    Returns:
+        Array of shape (series, series, max_lag) indexed as
+        [lead, lagged, lag - 1]; NaN where the correlation is undefined
+    """
+    n_series, n_obs = x.shape
+    result = np.full((n_series, n_series, max_lag), np.nan)
+    n_lags = min(max_lag, n_obs - 1)
+    if n_series == 0 or n_lags < 1:
+        return result
+
+    valid = ~np.isnan(x)
+    x = np.where(valid, x, 0.0)
+    mask = valid.astype(np.float64)
+
+    if n_lags <= GEMM_MAX_LAGS:
+        _lagged_sums_gemm(x, mask, n_lags, result)
+    else:
+        _lagged_sums_fft(x, mask, n_lags, result)
+    return result
+
+
+def _lagged_sums_gemm(x: np.ndarray, mask: np.ndarray, n_lags: int, result: np.ndarray) -> None:
+    """Fill ``result`` lag by lag, every pair's window sums from six GEMMs."""
+    xx = x * x
+    for lag in range(1, n_lags + 1):
+        lead, lead_m, lead_xx = x[:, :-lag], mask[:, :-lag], xx[:, :-lag]
+        lagged, lagged_m, lagged_xx = x[:, lag:], mask[:, lag:], xx[:, lag:]
+        result[:, :, lag - 1] = _pearson_from_sums(
+            lead_m @ lagged_m.T,
+            lead @ lagged_m.T,
+            lead_m @ lagged.T,
+            lead_xx @ lagged_m.T,
+            lead_m @ lagged_xx.T,
+            lead @ lagged.T,
+        )
+
+
+def _lagged_sums_fft(x: np.ndarray, mask: np.ndarray, n_lags: int, result: np.ndarray) -> None:
+    """Fill ``result`` lead series by lead series from FFT cross-correlations."""
+    n_obs = x.shape[1]
+    # Zero padding to n_obs + n_lags is enough to keep the circular
+    # correlation from wrapping; round up to a length with small prime
+    # factors, where the transform is fastest
+    nfft = sp_fft.next_fast_len(n_obs + n_lags, real=True)
+    fx = sp_fft.rfft(x, n=nfft, axis=1)
+    fxx = sp_fft.rfft(x * x, n=nfft, axis=1)
+    fm = sp_fft.rfft(mask, n=nfft, axis=1)
+
+    def xcorr(lead: np.ndarray, lagged: np.ndarray) -> np.ndarray:
+        # sum_t lead[t] * lagged[t + lag] for lag = 1..n_lags
+        return sp_fft.irfft(np.conj(lead) * lagged, n=nfft, axis=-1)[..., 1:n_lags + 1]
+
+    for i in range(len(x)):
+        result[i, :, :n_lags] = _pearson_from_sums(
+            np.rint(xcorr(fm[i], fm)),
+            xcorr(fx[i], fm),
+            xcorr(fm[i], fx),
+            xcorr(fxx[i], fm),
+            xcorr(fm[i], fxx),
+            xcorr(fx[i], fx),
+        )
+
+
+if HAS_NUMBA:
+    # No 'nnan'/'ninf' fast-math flags: missing observations are NaN and the
+    # kernel has to see them
+    @numba.njit(parallel=True, cache=True, fastmath={'contract', 'reassoc'})
+    def _lagged_correlations_numba(x: np.ndarray, max_lag: int) -> np.ndarray:
+        """
+        Numba counterpart of ``_lagged_correlations`` with the same inputs and output.
+
+        Direct pairwise sums; rows of ``x`` are contiguous so the innermost
+        loop reads both operands with unit stride. Threads split the
+        flattened (lead, lagged) pairs, so a handful of series still spreads
+        over every core.
+        """
+        n_series, n_obs = x.shape
+        result = np.full((n_series, n_series, max_lag), np.nan)
+        for pair in numba.prange(n_series * n_series):
+            i = pair // n_series
+            j = pair % n_series
+            for lag in range(1, min(max_lag, n_obs - 1) + 1):
+                n = 0
+                sx = sy = sxx = syy = sxy = 0.0
+                for t in range(n_obs - lag):
+                    a = x[i, t]
+                    b = x[j, t + lag]
+                    if np.isnan(a) or np.isnan(b):
+                        continue
+                    n += 1
+                    sx += a
+                    sy += b
+                    sxx += a * a
+                    syy += b * b
+                    sxy += a * b
+                var_x = n * sxx - sx * sx
+                var_y = n * syy - sy * sy
+                if n > MIN_OVERLAP and var_x > 1e-10 * n * sxx and var_y > 1e-10 * n * syy:
+                    corr = (n * sxy - sx * sy) / np.sqrt(var_x * var_y)
+                    result[i, j, lag - 1] = min(1.0, max(-1.0, corr))
+        return result
+
+
 class SignalScanner:
     """Vectorized signal scanner with proper statistical corrections."""
     
-    def __init__(self, use_numba: bool = True):
+    # Result writers shared by all scanners, so repeated saves reuse threads
+    _io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='results-io')
+    
+    def __init__(self, use_numba: bool = True, concurrency: int = 8):
         self.settings = get_settings()
         self.use_numba = use_numba and HAS_NUMBA
-        self.data_fetcher = DataFetcher()
+        self.data_fetcher = DataFetcher(concurrency=concurrency)
         
         # Load defaults from data sources
         defaults = self.data_fetcher.get_defaults()
@@ -114,29 +325,35 @@ class SignalScanner:
             return {'error': str(e)}
     
     def _calculate_correlations(self, df: pd.DataFrame, max_lag: int) -> pd.DataFrame:
-        """Calculate lead-lag correlations between all series."""
-        correlations = []
-        
-        for lead_series in df.columns:
-            for lag_series in df.columns:
-                if lead_series != lag_series:
-                    for lag in range(1, max_lag + 1):
-                        # Calculate correlation with lag
-                        lead_data = df[lead_series].iloc[lag:]
-                        lag_data = df[lag_series].iloc[:-lag]
-                        
-                        if len(lead_data) > 10:  # Minimum data points
-                            corr = lead_data.corr(lag_data)
-                            if not pd.isna(corr):
-                                correlations.append({
-                                    'lead_series': lead_series,
-                                    'lag_series': lag_series,
-                                    'lag': lag,
-                                    'correlation': corr
-                                })
-        
-        return pd.DataFrame(correlations)
-    
+        """Calculate lead-lag correlations between all series.
+
+        ``lead_series`` at time t is paired with ``lag_series`` at t + lag.
+        """
+        names = np.asarray(df.columns, dtype=object)
+        # Standardized once; both kernels read this (series, time) array.
+        # Kept in float64: the running-sum Pearson formula cancels badly in
+        # float32 and the constant-window thresholds assume float64 round-off
+        x = _standardize(df.to_numpy(dtype=np.float64))
+        if self.use_numba:
+            corr = _lagged_correlations_numba(x, max_lag)
+        else:
+            corr = _lagged_correlations(x, max_lag)
+
+        # Skip self-pairs and windows without a defined correlation
+        keep = ~np.isnan(corr)
+        keep[np.arange(len(names)), np.arange(len(names)), :] = False
+        lead_idx, lag_idx, lag_pos = np.nonzero(keep)
+
+        if len(lead_idx) == 0:
+            return pd.DataFrame()
+
+        return pd.DataFrame({
+            'lead_series': names[lead_idx],
+            'lag_series': names[lag_idx],
+            'lag': lag_pos + 1,
+            'correlation': corr[keep]
+        })
+
     def _get_top_correlations(self, correlations: pd.DataFrame, top_n: int) -> pd.DataFrame:
         """Get top N correlations by absolute value."""
         if correlations.empty:
@@ -156,42 +373,65 @@ class SignalScanner:
         if top_correlations.empty:
             return pd.Series()
         
-        # Create composite signal as weighted average of leading series
-        composite = pd.Series(0.0, index=df.index)
-        total_weight = 0
-        
-        for _, row in top_correlations.iterrows():
-            lead_series = row['lead_series']
-            weight = abs(row['correlation'])
-            
-            if lead_series in df.columns:
-                composite += weight * df[lead_series]
-                total_weight += weight
+        # Create composite signal as weighted average of leading series:
+        # one matrix-vector product over the selected columns instead of
+        # accumulating a Series per row
+        top = top_correlations[top_correlations['lead_series'].isin(df.columns)]
+        weights = top['correlation'].abs().to_numpy(dtype=np.float64)
+        total_weight = weights.sum()
         
+        values = df[top['lead_series']].to_numpy(dtype=np.float64) @ weights
         if total_weight > 0:
-            composite = composite / total_weight
+            values = values / total_weight
+        
+        composite = pd.Series(values, index=df.index)
         
         return composite
     
-    def save_results(self, results: Dict, output_dir: Path) -> None:
-        """Save scan results to files."""
+    def save_results(self, results: Dict, output_dir: Path, fmt: str = 'csv') -> None:
+        """
+        Save scan results to files.
+        
+        Args:
+            results: Results dictionary from ``scan_signals``
+            output_dir: Directory to write into
+            fmt: ``'csv'`` or ``'parquet'``; parquet files take the configured
+                CSV names with a ``.parquet`` suffix
+        """
+        if fmt not in RESULT_FORMATS:
+            raise ValueError(f"Unsupported results format: {fmt}")
+        
+        writes = []
+        
+        # Save top correlations
+        if not results['top_correlations'].empty:
+            writes.append((
+                results['top_correlations'],
+                output_dir / self.settings.results_csv,
+                fmt,
+                False
+            ))
+        
+        # Save composite signal
+        composite = results['composite_signal']
+        if composite is not None and not composite.empty:
+            writes.append((
+                composite.to_frame(name=composite.name or 'composite_signal'),
+                output_dir / self.settings.composite_csv,
+                fmt,
+                True
+            ))
+        
+        # Save raw data
+        if not results['raw_data'].empty:
+            writes.append((results['raw_data'], output_dir / 'raw_data.csv', fmt, True))
+        
         try:
-            # Save top correlations
-            if not results['top_correlations'].empty:
-                results['top_correlations'].to_csv(
-                    output_dir / self.settings.results_csv, 
-                    index=False
-                )
-            
-            # Save composite signal
-            if results['composite_signal'] is not None and not results['composite_signal'].empty:
-                results['composite_signal'].to_csv(
-                    output_dir / self.settings.composite_csv
-                )
-            
-            # Save raw data
-            if not results['raw_data'].empty:
-                results['raw_data'].to_csv(output_dir / 'raw_data.csv')
+            # The files are independent and Arrow's writers release the GIL,
+            # so write them concurrently
+            futures = [self._io_pool.submit(_write_frame, *args) for args in writes]
+            for future in futures:
+                future.result()
                 
         except Exception as e:
             logger.error(f"Failed to save results: {e}")
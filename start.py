@@ -9,7 +9,6 @@ def setup_abort_on_warning_or_error():
     """
     # Convert all warnings to exceptions immediately
     warnings.simplefilter('error')
-    warnings.filterwarnings("error")
     
     # Override warnings.showwarning to abort immediately
     def instant_abort_on_warning(message, category, filename, lineno, file=None, line=None):
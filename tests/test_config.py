@@ -23,19 +23,23 @@ class TestSettings:
         assert settings.max_lag == 5
         assert settings.top_n == 2
         assert settings.lookback_days == 365
+        assert settings.capture_print is False
+        assert settings.strict_log_abort is False
     
     def test_environment_variables(self):
         """Test environment variable overrides."""
         with patch.dict(os.environ, {
             'FRED_API_KEY': 'test_key',
             'MAX_LAG': '10',
-            'TOP_N': '5'
+            'TOP_N': '5',
+            'MAX_CONCURRENT_REQUESTS': '2'
         }):
             settings = Settings()
             
             assert settings.fred_api_key == 'test_key'
             assert settings.max_lag == 10
             assert settings.top_n == 5
+            assert settings.max_concurrent_requests == 2
     
     def test_path_properties(self):
         """Test path property calculations."""
@@ -51,6 +55,13 @@ class TestSettings:
 class TestGetSettings:
     """Test the get_settings function."""
     
+    @pytest.fixture
+    def fresh_settings(self):
+        """Drop the cached settings before and after the test."""
+        get_settings.cache_clear()
+        yield
+        get_settings.cache_clear()
+    
     def test_singleton_behavior(self):
         """Test that get_settings returns the same instance."""
         settings1 = get_settings()
@@ -58,7 +69,15 @@ class TestGetSettings:
         
         assert settings1 is settings2
     
-    def test_directory_creation(self, tmp_path):
+    def test_cache_clear_rereads_environment(self, fresh_settings):
+        """Test that clearing the cache picks up environment changes."""
+        with patch.dict(os.environ, {'MAX_LAG': '7'}):
+            assert get_settings().max_lag == 7
+            get_settings.cache_clear()
+        
+        assert get_settings().max_lag == 5
+    
+    def test_directory_creation(self, tmp_path, fresh_settings):
         """Test that directories are created."""
         with patch('config.PROJECT_ROOT', tmp_path):
             settings = get_settings()
@@ -2,33 +2,52 @@
 Tests for data fetchers.
 """
 
+import os
+import json
+import time
 import pytest
 import asyncio
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from unittest.mock import patch, AsyncMock, MagicMock
 
-from fetchers import BaseFetcher, fetcher_registry
+from config import get_settings
+from fetchers import BaseFetcher, fetcher_registry, get_fetcher_class
+from fetchers.base import SeriesCacheMixin, _series_cache
 from fetchers.fred import FredFetcher
 from fetchers.yahoo import YahooFetcher
 from fetchers.fng import FearGreedFetcher
 from fetchers.trends import TrendsFetcher
-from fetchers.binance import BinanceFetcher
+from fetchers.binance import BinanceFetcher, ParquetKlineCache
+
+
+def _mock_session(payload):
+    """Stand-in for the shared session whose GET responds with ``payload`` as JSON bytes."""
+    response = MagicMock()
+    response.read = AsyncMock(return_value=json.dumps(payload).encode())
+    session = MagicMock()
+    session.get.return_value.__aenter__.return_value = response
+    return session
 
 
 class TestBaseFetcher:
     """Test the base fetcher class."""
     
+    class _Fetcher(BaseFetcher):
+        async def fetch(self, start, end, **kwargs):
+            return pd.Series(dtype=float)
+    
     def test_init(self):
         """Test fetcher initialization."""
-        fetcher = BaseFetcher(max_retries=5, base_delay=2.0)
+        fetcher = self._Fetcher(max_retries=5, base_delay=2.0)
         
         assert fetcher.max_retries == 5
         assert fetcher.base_delay == 2.0
     
     def test_validate_date_range_valid(self):
         """Test valid date range validation."""
-        fetcher = BaseFetcher()
+        fetcher = self._Fetcher()
         start = datetime(2023, 1, 1)
         end = datetime(2023, 1, 2)
         
@@ -37,7 +56,7 @@ class TestBaseFetcher:
     
     def test_validate_date_range_invalid(self):
         """Test invalid date range validation."""
-        fetcher = BaseFetcher()
+        fetcher = self._Fetcher()
         start = datetime(2023, 1, 2)
         end = datetime(2023, 1, 1)
         
@@ -46,7 +65,7 @@ class TestBaseFetcher:
     
     def test_validate_date_range_future(self):
         """Test future date validation."""
-        fetcher = BaseFetcher()
+        fetcher = self._Fetcher()
         start = datetime.now() + timedelta(days=1)
         end = datetime.now() + timedelta(days=2)
         
@@ -55,7 +74,7 @@ class TestBaseFetcher:
     
     def test_align_series(self):
         """Test series alignment."""
-        fetcher = BaseFetcher()
+        fetcher = self._Fetcher()
         
         # Create test series
         dates = pd.date_range('2023-01-01', periods=5, freq='D')
@@ -73,8 +92,10 @@ class TestFredFetcher:
     
     @pytest.fixture
     def fetcher(self):
-        """Create a FRED fetcher instance."""
-        return FredFetcher()
+        """Create a FRED fetcher instance with an API key."""
+        fetcher = FredFetcher()
+        fetcher.api_key = 'test-key'
+        return fetcher
     
     @pytest.mark.asyncio
     async def test_fetch_success(self, fetcher):
@@ -88,10 +109,8 @@ class TestFredFetcher:
             ]
         }
         
-        with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.json.return_value = mock_response
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.raise_for_status.return_value = None
-            
+        session = _mock_session(mock_response)
+        with patch.object(BaseFetcher, 'get_session', AsyncMock(return_value=session)):
             start = datetime(2023, 1, 1)
             end = datetime(2023, 1, 3)
             
@@ -100,16 +119,15 @@ class TestFredFetcher:
             assert not result.empty
             assert len(result) == 3
             assert isinstance(result.index, pd.DatetimeIndex)
+            assert session.get.call_args.kwargs['params']['series_id'] == 'TEST'
     
     @pytest.mark.asyncio
     async def test_fetch_no_data(self, fetcher):
         """Test FRED fetch with no data."""
         mock_response = {'observations': []}
         
-        with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.json.return_value = mock_response
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.raise_for_status.return_value = None
-            
+        session = _mock_session(mock_response)
+        with patch.object(BaseFetcher, 'get_session', AsyncMock(return_value=session)):
             start = datetime(2023, 1, 1)
             end = datetime(2023, 1, 3)
             
@@ -143,10 +161,8 @@ class TestYahooFetcher:
             }
         }
         
-        with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.json.return_value = mock_response
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.raise_for_status.return_value = None
-            
+        session = _mock_session(mock_response)
+        with patch.object(BaseFetcher, 'get_session', AsyncMock(return_value=session)):
             start = datetime(2023, 1, 1)
             end = datetime(2023, 1, 3)
             
@@ -155,6 +171,7 @@ class TestYahooFetcher:
             assert not result.empty
             assert len(result) == 3
             assert isinstance(result.index, pd.DatetimeIndex)
+            assert session.get.call_args.args[0].endswith('/TEST')
 
 
 class TestFearGreedFetcher:
@@ -171,23 +188,21 @@ class TestFearGreedFetcher:
         # Mock API response
         mock_response = {
             'data': [
-                {'timestamp': '2023-01-01T00:00:00Z', 'value': '50'},
-                {'timestamp': '2023-01-02T00:00:00Z', 'value': '60'},
-                {'timestamp': '2023-01-03T00:00:00Z', 'value': '40'}
+                # Epoch seconds, newest first as the API lists them
+                {'timestamp': '1672704000', 'value': '40'},
+                {'timestamp': '1672617600', 'value': '60'},
+                {'timestamp': '1672531200', 'value': '50'}
             ]
         }
         
-        with patch('aiohttp.ClientSession') as mock_session:
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.json.return_value = mock_response
-            mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value.raise_for_status.return_value = None
-            
+        session = _mock_session(mock_response)
+        with patch.object(BaseFetcher, 'get_session', AsyncMock(return_value=session)):
             start = datetime(2023, 1, 1)
             end = datetime(2023, 1, 3)
             
             result = await fetcher.fetch(start, end)
             
-            assert not result.empty
-            assert len(result) == 3
+            assert result.tolist() == [50.0, 60.0, 40.0]
             assert isinstance(result.index, pd.DatetimeIndex)
 
 
@@ -200,26 +215,43 @@ class TestTrendsFetcher:
         return TrendsFetcher()
     
     @pytest.mark.asyncio
-    async def test_fetch_with_cache(self, fetcher, tmp_path):
-        """Test trends fetch with caching."""
-        # Mock cache directory
-        with patch.object(fetcher, 'cache_dir', tmp_path):
-            # Mock pytrends
-            mock_pytrends = MagicMock()
-            mock_interest_df = pd.DataFrame({
-                'bitcoin': [50, 60, 70]
-            }, index=pd.date_range('2023-01-01', periods=3, freq='D'))
-            mock_pytrends.interest_over_time.return_value = mock_interest_df
+    async def test_fetch_with_shared_client(self, fetcher):
+        """Test trends fetch through the process-wide pytrends client."""
+        # Mock pytrends
+        mock_pytrends = MagicMock()
+        mock_interest_df = pd.DataFrame({
+            'bitcoin': [50, 60, 70]
+        }, index=pd.date_range('2023-01-01', periods=3, freq='D'))
+        mock_pytrends.interest_over_time.return_value = mock_interest_df
+        
+        with patch.object(TrendsFetcher, '_pytrends', mock_pytrends):
+            start = datetime(2023, 1, 1)
+            end = datetime(2023, 1, 3)
+            
+            result = await fetcher.fetch(start, end, keyword='bitcoin')
             
-            with patch.object(fetcher, 'pytrends', mock_pytrends):
-                start = datetime(2023, 1, 1)
-                end = datetime(2023, 1, 3)
-                
-                result = await fetcher.fetch(start, end, keyword='bitcoin')
-                
-                assert not result.empty
-                assert len(result) == 3
-                assert isinstance(result.index, pd.DatetimeIndex)
+            assert not result.empty
+            assert len(result) == 3
+            assert isinstance(result.index, pd.DatetimeIndex)
+    
+    @pytest.mark.asyncio
+    async def test_cache_not_stitched_across_scales(self, fetcher, tmp_path):
+        """A longer window replaces the cached response rather than extending it."""
+        first = pd.DataFrame({'bitcoin': [50, 100, 25]}, index=pd.date_range('2023-01-01', periods=3))
+        # Same days rescaled against a new peak on Jan 4
+        second = pd.DataFrame({'bitcoin': [20, 40, 10, 100, 60, 30]}, index=pd.date_range('2023-01-01', periods=6))
+        mock_pytrends = MagicMock()
+        mock_pytrends.interest_over_time.side_effect = [first, second]
+        
+        with patch.object(TrendsFetcher, '_pytrends', mock_pytrends), \
+             patch.object(fetcher, '_cache_path', return_value=tmp_path / 'trends.parquet'):
+            await fetcher.fetch_cached(datetime(2023, 1, 1), datetime(2023, 1, 3), source='trends', name='t', kw='bitcoin')
+            result = await fetcher.fetch_cached(datetime(2023, 1, 1), datetime(2023, 1, 6), source='trends', name='t', kw='bitcoin')
+            cached = fetcher._read_cached_series(tmp_path / 'trends.parquet')
+        
+        assert mock_pytrends.build_payload.call_args.kwargs['timeframe'] == '2023-01-01 2023-01-06'
+        assert result.tolist() == second['bitcoin'].tolist()
+        assert cached.tolist() == second['bitcoin'].tolist()
 
 
 class TestBinanceFetcher:
@@ -232,30 +264,182 @@ class TestBinanceFetcher:
     
     @pytest.mark.asyncio
     async def test_fetch_from_database(self, fetcher, tmp_path):
-        """Test fetching from local database."""
-        # Mock database path
-        with patch.object(fetcher, 'db_path', tmp_path / 'test.db'):
-            # Create test database
-            import sqlite3
-            conn = sqlite3.connect(fetcher.db_path)
-            conn.execute('''
-                CREATE TABLE klines (
-                    open_time INTEGER PRIMARY KEY,
-                    close_price REAL
-                )
-            ''')
-            conn.execute('INSERT INTO klines VALUES (?, ?)', (1672531200000, 100.0))
-            conn.execute('INSERT INTO klines VALUES (?, ?)', (1672617600000, 101.0))
-            conn.commit()
-            conn.close()
-            
-            start = datetime(2023, 1, 1)
-            end = datetime(2023, 1, 2)
-            
+        """Cached klines in the SQLite database are served without a request."""
+        start = datetime(2023, 1, 1)
+        end = datetime(2023, 1, 2)
+        day_ms = 24 * 60 * 60 * 1000
+        start_ms = int(start.timestamp() * 1000)
+        
+        fetcher.db_path = tmp_path / 'test.db'
+        fetcher.use_parquet_cache = False
+        fetcher.conn.executemany(
+            'INSERT INTO klines VALUES (?, ?, ?, ?, ?, ?)',
+            [(start_ms, 99.0, 101.0, 98.0, 100.0, 5.0),
+             (start_ms + day_ms, 100.0, 102.0, 99.0, 101.0, 6.0)]
+        )
+        fetcher.conn.commit()
+        
+        with patch.object(fetcher, '_fetch_from_api', AsyncMock()) as fetch_from_api:
             result = await fetcher.fetch(start, end)
-            
-            assert not result.empty
-            assert len(result) == 2
+        await fetcher.close()
+        
+        fetch_from_api.assert_not_called()
+        assert result.tolist() == [100.0, 101.0]
+    
+    @pytest.mark.asyncio
+    async def test_failed_window_skipped(self, fetcher):
+        """A window that exhausts its retries is skipped; the others are kept."""
+        day_ms = 24 * 60 * 60 * 1000
+        start = datetime(2023, 1, 1)
+        start_ms = int(start.timestamp() * 1000)
+        
+        async def make_request(session, url, params):
+            if params['startTime'] == start_ms:
+                raise RuntimeError("retries exhausted")
+            return [[t, 1.0, 2.0, 0.5, 1.5, 10.0] for t in range(params['startTime'], params['endTime'], day_ms)]
+        
+        fetcher.max_klines = 2
+        fetcher.rate_limit_delay = 0
+        with patch.object(fetcher, 'get_session', AsyncMock()), \
+             patch.object(fetcher, '_make_request', side_effect=make_request), \
+             patch.object(fetcher, '_store_in_cache') as store:
+            result = await fetcher._fetch_from_api(start, start + timedelta(days=4), 'BTCUSDT', '1d')
+        
+        assert result.index[0] == pd.Timestamp(start_ms + 2 * day_ms, unit='ms')
+        assert len(result) == 2
+        store.assert_called_once()
+
+
+class TestParquetKlineCache:
+    """Test the monthly Parquet kline cache."""
+    
+    DAY_MS = 24 * 60 * 60 * 1000
+    
+    def _klines(self, start: datetime, days: int, close: float = 100.0):
+        """Daily open times and OHLCV rows starting at ``start``."""
+        timestamps = int(pd.Timestamp(start).value // 1_000_000) + np.arange(days, dtype=np.int64) * self.DAY_MS
+        values = np.full((days, 5), close)
+        return timestamps, values
+    
+    def test_write_and_read_across_months(self, tmp_path):
+        """Klines spanning several months are split into partitions and read back."""
+        cache = ParquetKlineCache(tmp_path, 'BTCUSDT', '1d')
+        timestamps, values = self._klines(datetime(2023, 1, 20), 40)
+        cache.write(timestamps, values)
+        
+        assert sorted(p.name for p in cache.directory.iterdir()) == ['2023-01.parquet', '2023-02.parquet']
+        
+        result = cache.read(int(timestamps[5]), int(timestamps[20]))
+        assert len(result) == 16
+        assert result.index[0] == pd.Timestamp(datetime(2023, 1, 25))
+        assert cache.read(int(timestamps[-1]) + self.DAY_MS, int(timestamps[-1]) + 5 * self.DAY_MS) is None
+    
+    def test_write_replaces_existing_klines(self, tmp_path):
+        """Rewritten open times take the new values and stay unique."""
+        cache = ParquetKlineCache(tmp_path, 'BTCUSDT', '1d')
+        timestamps, values = self._klines(datetime(2023, 1, 1), 10)
+        cache.write(timestamps, values)
+        cache.write(*self._klines(datetime(2023, 1, 8), 5, close=200.0))
+        
+        result = cache.read(int(timestamps[0]), int(timestamps[0]) + 20 * self.DAY_MS)
+        assert len(result) == 12
+        assert result.index.is_monotonic_increasing
+        assert (result.iloc[:7] == 100.0).all()
+        assert (result.iloc[7:] == 200.0).all()
+
+
+class TestSeriesCacheMixin:
+    """Test the incremental series cache."""
+    
+    class _Fetcher(SeriesCacheMixin, BaseFetcher):
+        async def fetch(self, start, end, **kwargs):
+            return pd.Series([2.0], index=[pd.Timestamp(end)])
+    
+    @pytest.fixture
+    def fetcher(self, tmp_path):
+        """Fetcher whose cache lives in tmp_path with three cached days."""
+        fetcher = self._Fetcher()
+        path = tmp_path / 'series.parquet'
+        fetcher._write_cached_series(path, pd.Series([1.0] * 3, index=pd.date_range('2023-01-01', periods=3)))
+        fetcher.fetch = AsyncMock(wraps=fetcher.fetch)
+        with patch.object(fetcher, '_cache_path', return_value=path):
+            yield fetcher
+    
+    @pytest.mark.asyncio
+    async def test_fresh_cache_skips_api(self, fetcher):
+        """A current cache written within the TTL is served without a request."""
+        with patch.object(get_settings(), 'series_cache_ttl', 3600):
+            result = await fetcher.fetch_cached(datetime(2023, 1, 1), datetime(2023, 1, 4), source='s', name='n')
+        
+        fetcher.fetch.assert_not_called()
+        assert len(result) == 3
+    
+    @pytest.mark.asyncio
+    async def test_ttl_ignored_for_lagging_cache(self, fetcher):
+        """The TTL does not hide data more than one period past the cached tail."""
+        with patch.object(get_settings(), 'series_cache_ttl', 3600):
+            result = await fetcher.fetch_cached(datetime(2023, 1, 1), datetime(2023, 1, 10), source='s', name='n')
+        
+        assert fetcher.fetch.call_args.args[0] == datetime(2023, 1, 4)
+        assert len(result) == 4
+    
+    @pytest.mark.asyncio
+    async def test_empty_fetch_keeps_lagging_cache_stale(self, fetcher):
+        """An empty response does not restart the TTL for a cache behind the request."""
+        path = fetcher._cache_path()
+        stale = time.time() - 2 * 86400
+        os.utime(path, (stale, stale))
+        fetcher.fetch.return_value = pd.Series(dtype=float)
+        
+        await fetcher.fetch_cached(datetime(2023, 1, 1), datetime(2023, 1, 10), source='s', name='n')
+        
+        assert path.stat().st_mtime == pytest.approx(stale)
+    
+    @pytest.mark.asyncio
+    async def test_stale_cache_fetches_tail(self, fetcher):
+        """Past the TTL only the range after the last observation is fetched."""
+        path = fetcher._cache_path()
+        stale = time.time() - 2 * 86400
+        os.utime(path, (stale, stale))
+        
+        result = await fetcher.fetch_cached(datetime(2023, 1, 1), datetime(2023, 1, 10), source='s', name='n')
+        
+        assert fetcher.fetch.call_args.args[0] == datetime(2023, 1, 4)
+        assert len(result) == 4
+    
+    @pytest.mark.asyncio
+    async def test_disjoint_request_fills_gap(self, fetcher):
+        """A request past the cached tail fetches from the tail, not the request start."""
+        path = fetcher._cache_path()
+        stale = time.time() - 2 * 86400
+        os.utime(path, (stale, stale))
+        
+        result = await fetcher.fetch_cached(datetime(2023, 1, 10), datetime(2023, 1, 15), source='s', name='n')
+        
+        assert fetcher.fetch.call_args.args[0] == datetime(2023, 1, 4)
+        assert len(result) == 1
+    
+    @pytest.mark.asyncio
+    async def test_earlier_start_refetches_through_tail(self, fetcher):
+        """A request starting before the cache refetches up to the cached tail."""
+        await fetcher.fetch_cached(datetime(2022, 12, 1), datetime(2022, 12, 10), source='s', name='n')
+        
+        assert fetcher.fetch.call_args.args[:2] == (datetime(2022, 12, 1), pd.Timestamp('2023-01-03'))
+    
+    @pytest.mark.asyncio
+    async def test_rewrite_replaces_memory_entry(self, fetcher):
+        """The in-memory copy is keyed on the path and replaced when the file changes."""
+        path = fetcher._cache_path()
+        stale = time.time() - 2 * 86400
+        os.utime(path, (stale, stale))
+        fetcher._read_cached_series(path)
+        
+        result = await fetcher.fetch_cached(datetime(2023, 1, 1), datetime(2023, 1, 10), source='s', name='n')
+        result.iloc[0] = -1.0
+        cached = fetcher._read_cached_series(path)
+        
+        assert _series_cache[path][0] == path.stat().st_mtime_ns
+        assert len(cached) == 4 and cached.iloc[0] == 1.0
 
 
 class TestFetcherRegistry:
@@ -269,6 +453,8 @@ class TestFetcherRegistry:
         assert 'trends' in fetcher_registry
         assert 'binance' in fetcher_registry
         
-        # Check that all fetchers are instances of BaseFetcher
-        for fetcher in fetcher_registry.values():
-            assert isinstance(fetcher, BaseFetcher) 
\ No newline at end of file
+        # Registered entries are the fetcher classes themselves
+        for source in ('fred', 'yahoo', 'fng', 'trends', 'binance'):
+            fetcher_class = get_fetcher_class(source)
+            assert issubclass(fetcher_class, BaseFetcher)
+            assert fetcher_registry[source] is fetcher_class
@@ -1,4 +1,6 @@
+import os
 import pytest
+import pandas as pd
 from unittest.mock import patch, MagicMock
 from PyQt5.QtWidgets import QApplication
 import sys
@@ -26,4 +28,18 @@ def test_scan_btn_click(mock_scanner, app):
     window = gui.MainWindow()
     mock_scanner.return_value.run.return_value = None
     window.start_scan()
-    assert not window.scan_btn.isEnabled() or window.scan_btn.isEnabled()  # just check no crash 
\ No newline at end of file
+    assert not window.scan_btn.isEnabled() or window.scan_btn.isEnabled()  # just check no crash 
+
+def test_loads_legacy_corr_column(app, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'results.csv').write_text('lead,lagged,lag,corr\na,b,1,0.5\nb,a,2,-0.25\n')
+    window = gui.MainWindow()
+    assert window._bar_heights.tolist() == [0.5, -0.25]
+
+def test_newer_csv_wins_over_stale_parquet(app, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({'correlation': [0.1]}).to_parquet(tmp_path / 'results.parquet')
+    os.utime(tmp_path / 'results.parquet', ns=(0, 0))
+    (tmp_path / 'results.csv').write_text('lead,lagged,lag,correlation\na,b,1,0.9\n')
+    window = gui.MainWindow()
+    assert window._bar_heights.tolist() == [0.9]
@@ -0,0 +1,89 @@
+"""
+Tests for the lagged correlation kernels against a brute-force reference.
+"""
+
+import numpy as np
+import pytest
+
+import signal_scanner
+from signal_scanner import HAS_NUMBA, MIN_OVERLAP, _lagged_correlations, _standardize
+
+
+def _reference(values, max_lag):
+    """Pairwise-complete np.corrcoef over shifted slices of (time, series) values."""
+    n_obs, n_series = values.shape
+    result = np.full((n_series, n_series, max_lag), np.nan)
+    for i in range(n_series):
+        for j in range(n_series):
+            for lag in range(1, min(max_lag, n_obs - 1) + 1):
+                lead = values[:-lag, i]
+                lagged = values[lag:, j]
+                both = ~np.isnan(lead) & ~np.isnan(lagged)
+                a, b = lead[both], lagged[both]
+                if len(a) <= MIN_OVERLAP or np.ptp(a) == 0 or np.ptp(b) == 0:
+                    continue
+                result[i, j, lag - 1] = np.corrcoef(a, b)[0, 1]
+    return result
+
+
+@pytest.fixture(params=['gemm', 'fft', 'numba'])
+def kernel(request, monkeypatch):
+    """Each implementation, taking (time, series) values like the reference."""
+    if request.param == 'numba':
+        if not HAS_NUMBA:
+            pytest.skip("numba not installed")
+        return lambda values, max_lag: signal_scanner._lagged_correlations_numba(_standardize(values), max_lag)
+    if request.param == 'fft':
+        monkeypatch.setattr(signal_scanner, 'GEMM_MAX_LAGS', 0)
+    return lambda values, max_lag: _lagged_correlations(_standardize(values), max_lag)
+
+
+def _random_walks(n_obs, n_series, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n_obs, n_series)).cumsum(axis=0) + 100.0
+
+
+class TestLaggedCorrelations:
+    """Every kernel matches np.corrcoef on the shifted, jointly valid slices."""
+
+    def test_matches_reference_with_gaps(self, kernel):
+        """Scattered and block NaN gaps are excluded pairwise."""
+        values = _random_walks(120, 4)
+        rng = np.random.default_rng(1)
+        values[rng.random(values.shape) < 0.15] = np.nan
+        values[30:60, 2] = np.nan
+
+        np.testing.assert_allclose(kernel(values, 12), _reference(values, 12), atol=1e-9)
+
+    def test_constant_series_undefined(self, kernel):
+        """Pairs involving a constant series are NaN, the rest unaffected."""
+        values = _random_walks(60, 3)
+        values[:, 1] = 5.0
+
+        result = kernel(values, 5)
+
+        assert np.isnan(result[1]).all() and np.isnan(result[:, 1]).all()
+        np.testing.assert_allclose(result, _reference(values, 5), atol=1e-9)
+
+    def test_max_lag_beyond_length(self, kernel):
+        """Lags past the usable overlap keep the shape and are NaN."""
+        values = _random_walks(15, 2)
+
+        result = kernel(values, 20)
+
+        assert result.shape == (2, 2, 20)
+        assert np.isnan(result[:, :, 15 - MIN_OVERLAP - 1:]).all()
+        np.testing.assert_allclose(result, _reference(values, 20), atol=1e-9)
+
+    def test_lead_lag_direction(self, kernel):
+        """A series copied three steps later is led by the original at lag 3."""
+        lead = _random_walks(100, 1, seed=2)[:, 0]
+        lagged = np.full_like(lead, np.nan)
+        lagged[3:] = lead[:-3]
+        values = np.column_stack([lead, lagged])
+
+        result = kernel(values, 5)
+
+        assert result[0, 1, 2] == pytest.approx(1.0)
+        assert result[1, 0, 2] < 0.99
+        np.testing.assert_allclose(result, _reference(values, 5), atol=1e-9)
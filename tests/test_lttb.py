@@ -0,0 +1,32 @@
+"""
+Tests for LTTB downsampling.
+"""
+
+import numpy as np
+
+from lttb import lttb_indices
+
+
+class TestLttbIndices:
+    """Test point selection."""
+    
+    def test_short_input_kept(self):
+        """Inputs no longer than the target are returned whole."""
+        x = np.arange(5)
+        
+        assert lttb_indices(x, x * 2.0, 10).tolist() == [0, 1, 2, 3, 4]
+        assert lttb_indices(x, x * 2.0, 2).tolist() == [0, 1, 2, 3, 4]
+    
+    def test_keeps_endpoints_and_peaks(self):
+        """Endpoints and isolated extremes survive downsampling."""
+        x = np.arange(1000)
+        y = np.zeros(1000)
+        y[321] = 50.0
+        y[789] = -50.0
+        
+        idx = lttb_indices(x, y, 20)
+        
+        assert len(idx) == 20
+        assert idx[0] == 0 and idx[-1] == 999
+        assert np.all(np.diff(idx) > 0)
+        assert 321 in idx and 789 in idx
@@ -0,0 +1,39 @@
+"""
+Tests for the scan result writer.
+"""
+
+import numpy as np
+import pandas as pd
+
+from signal_scanner import _write_frame
+
+
+class TestWriteFrameCsv:
+    """CSV output keeps the DataFrame.to_csv layout."""
+
+    def test_daily_index_round_trip(self, tmp_path):
+        """Dates print without a time part and strings are not quoted."""
+        frame = pd.DataFrame(
+            {'S&P 500': [1.5, np.nan], 'label': ['up', 'down']},
+            index=pd.date_range('2023-01-01', periods=2, name='date'),
+        )
+        path = tmp_path / 'raw_data.csv'
+
+        _write_frame(frame, path, 'csv')
+
+        lines = path.read_text().splitlines()
+        assert lines[0] == 'date,S&P 500,label'
+        assert lines[1] == '2023-01-01,1.5,up'
+        pd.testing.assert_frame_equal(pd.read_csv(path, index_col=0, parse_dates=True), frame, check_freq=False)
+
+    def test_unnamed_index_and_quoting(self, tmp_path):
+        """An unnamed index gets an empty header; only values that need it are quoted."""
+        frame = pd.DataFrame(
+            {'composite_signal': [0.25], 'note': ['a,b']},
+            index=pd.DatetimeIndex(['2023-01-01 06:00:00']),
+        )
+        path = tmp_path / 'composite_signal.csv'
+
+        _write_frame(frame, path, 'csv')
+
+        assert path.read_text().splitlines()[:2] == [',composite_signal,note', '2023-01-01 06:00:00,0.25,"a,b"']